@@ -4,46 +4,67 @@ from dotenv import load_dotenv
 load_dotenv()
 from langchain_google_genai import ChatGoogleGenerativeAI
 import os
+from singleflight import coalesce, llm_flight, llm_key
+from hedging import hedge, llm_hedger
+from event_log import log_agent_step, verbose_enabled
 
 
 ## call the gemini models
 llm=ChatGoogleGenerativeAI(model="gemini-1.5-flash",
-                           verbose=True,
+                           verbose=verbose_enabled(),
                            temperature=0.5,
                            google_api_key=os.getenv("GOOGLE_API_KEY"))
 
-# Creating a senior researcher agent with memory and verbose mode
+# Optionally duplicate Gemini calls that run past the usual latency (CREW_LLM_HEDGING=1)
+llm=hedge(llm, "_generate", llm_hedger)
 
-news_researcher=Agent(
-    role="Senior Researcher",
-    goal='Unccover ground breaking technologies in {topic}',
-    verbose=True,
-    memory=True,
-    backstory=(
-        "Driven by curiosity, you're at the forefront of"
-        "innovation, eager to explore and share knowledge that could change"
-        "the world."
+# Concurrent identical prompts share one in-flight Gemini call
+llm=coalesce(llm, "_generate", llm_flight, llm_key)
 
-    ),
-    tools=[tool],
-    llm=llm,
-    allow_delegation=True
+# Creating a senior researcher agent with memory; ReAct traces go to the event log
+# unless CREW_VERBOSE=1 asks for crewai's own stdout output
 
-)
+def create_news_researcher():
+    """Build a senior researcher agent; use a fresh one per concurrent run"""
+    return Agent(
+        role="Senior Researcher",
+        goal='Unccover ground breaking technologies in {topic}',
+        verbose=verbose_enabled(),
+        memory=True,
+        backstory=(
+            "Driven by curiosity, you're at the forefront of"
+            "innovation, eager to explore and share knowledge that could change"
+            "the world."
+
+        ),
+        tools=[tool],
+        llm=llm,
+        step_callback=log_agent_step,
+        allow_delegation=True
+
+    )
 
 ## creating a write agent with custom tools responsible in writing news blog
 
-news_writer = Agent(
-  role='Writer',
-  goal='Narrate compelling tech stories about {topic}',
-  verbose=True,
-  memory=True,
-  backstory=(
-    "With a flair for simplifying complex topics, you craft"
-    "engaging narratives that captivate and educate, bringing new"
-    "discoveries to light in an accessible manner."
-  ),
-  tools=[tool],
-  llm=llm,
-  allow_delegation=False
-)
+def create_news_writer():
+    """Build a writer agent; use a fresh one per concurrent run"""
+    return Agent(
+      role='Writer',
+      goal='Narrate compelling tech stories about {topic}',
+      verbose=verbose_enabled(),
+      memory=True,
+      backstory=(
+        "With a flair for simplifying complex topics, you craft"
+        "engaging narratives that captivate and educate, bringing new"
+        "discoveries to light in an accessible manner."
+      ),
+      tools=[tool],
+      llm=llm,
+      step_callback=log_agent_step,
+      allow_delegation=False
+    )
+
+# crewai mutates agents while a crew runs, so concurrent runs (batch.py)
+# build their own through the factories above
+news_researcher=create_news_researcher()
+news_writer=create_news_writer()
@@ -5,6 +5,7 @@ from datetime import datetime
 import time
 from pathlib import Path
 import asyncio
+import contextlib
 
 try:
     asyncio.get_running_loop()
@@ -16,8 +17,11 @@ sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 try:
     from crewai import Crew, Process
-    from tasks import research_task, write_task
-    from agents import news_researcher, news_writer
+    from tasks import create_research_task, create_write_task
+    from agents import create_news_researcher, create_news_writer
+    from tools import search_topic
+    from profiling import RunProfiler
+    from event_log import run_context, verbose_enabled
 except ImportError as e:
     st.error(f"Error importing modules: {e}")
     st.error("Make sure all your project files (agents.py, tasks.py, tools.py, crew.py) are in the same directory as this Streamlit app.")
@@ -241,8 +245,9 @@ with col1:
     
     # Advanced options
     with st.expander("⚙️ Advanced Options"):
-        verbose_mode = st.checkbox("Verbose Mode", value=True, help="Show detailed execution logs")
+        verbose_mode = st.checkbox("Verbose Mode", value=verbose_enabled(), help="Print crewai's detailed execution logs (CREW_VERBOSE)")
         save_to_file = st.checkbox("Save Output to File", value=True, help="Save the final article to a markdown file")
+        profile_run = st.checkbox("Profile Run", value=False, help="Capture a CPU sample profile and memory allocation snapshot of the run")
         
         if save_to_file:
             output_filename = st.text_input(
@@ -343,9 +348,12 @@ if st.button(
             progress_bar.progress(10)
             time.sleep(1)  # Brief pause for UX
             
+            # Fresh agents/tasks per run so concurrent sessions don't share crewai state
+            researcher = create_news_researcher()
+            writer = create_news_writer()
             crew = Crew(
-                agents=[news_researcher, news_writer],
-                tasks=[research_task, write_task],
+                agents=[researcher, writer],
+                tasks=[create_research_task(researcher), create_write_task(writer)],
                 process=Process.sequential,
                 verbose=verbose_mode
             )
@@ -357,7 +365,20 @@ if st.button(
             
             # Execute crew
             with st.spinner("🤖 Crew is working on your request..."):
-                result = crew.kickoff(inputs={'topic': topic})
+                with run_context() as run_id, search_topic(topic):
+                    # Optional CPU/memory profile, written to profiles/ next to the article
+                    # and named after the run ID so concurrent sessions don't collide
+                    if profile_run:
+                        profile_dir = os.path.join(
+                            os.path.dirname(os.path.abspath(output_filename if save_to_file else 'new-blog-post.md')),
+                            'profiles'
+                        )
+                        profiler = RunProfiler(profile_dir, f"profile-{run_id}")
+                    else:
+                        profiler = contextlib.nullcontext()
+                    
+                    with profiler:
+                        result = crew.kickoff(inputs={'topic': topic})
             
             # Calculate execution time
             execution_time = time.time() - start_time
@@ -416,6 +437,20 @@ if st.button(
                         mime="text/markdown"
                     )
             
+            # Profile summary and flamegraph input
+            if profile_run:
+                with st.expander("🔬 Run Profile", expanded=True):
+                    st.code(profiler.summary)
+                    st.caption(f"Profile files: {', '.join(profiler.files.values())}")
+                    with open(profiler.files['collapsed'], 'r', encoding='utf-8') as f:
+                        st.download_button(
+                            label="📥 Download Collapsed Stacks",
+                            data=f.read(),
+                            file_name=os.path.basename(profiler.files['collapsed']),
+                            mime="text/plain",
+                            help="Open with flamegraph.pl or speedscope"
+                        )
+            
             # Store result in session state for later access
             st.session_state.last_result = str(result)
             st.session_state.last_topic = topic
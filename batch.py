@@ -0,0 +1,306 @@
+"""
+Batch planner for AI Research & Writing Crew
+Clusters related topics, researches each cluster once and fans out the writing
+"""
+
+import argparse
+import contextvars
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from dotenv import load_dotenv
+
+from event_log import get_event_log, run_context, verbose_enabled
+from research_report import slugify
+from search_ranking import tokenize
+
+load_dotenv()
+
+log = get_event_log()
+
+
+# Subject areas that slightly raise the similarity of topics which already
+# share words, e.g. "AI in radiology" and "AI in pathology" are both healthcare
+TOPIC_DOMAINS = {
+    'healthcare': {
+        'health', 'healthcare', 'medicine', 'medical', 'clinical', 'clinic', 'hospital', 'patient',
+        'radiology', 'pathology', 'diagnostic', 'diagnosis', 'oncology', 'cancer', 'cardiology',
+        'neurology', 'dermatology', 'genomics', 'drug', 'pharma', 'pharmaceutical', 'surgery',
+        'telemedicine', 'nursing', 'biotech', 'imaging',
+    },
+    'finance': {
+        'finance', 'financial', 'fintech', 'banking', 'bank', 'insurance', 'trading', 'investment',
+        'investing', 'payment', 'lending', 'credit', 'accounting', 'crypto', 'cryptocurrency', 'tax',
+    },
+    'security': {'security', 'cybersecurity', 'privacy', 'fraud', 'encryption', 'malware'},
+    'entertainment': {
+        'music', 'gaming', 'game', 'film', 'movie', 'entertainment', 'media', 'streaming',
+        'art', 'journalism',
+    },
+    'education': {'education', 'school', 'teaching', 'student', 'university', 'edtech', 'tutoring'},
+    'agriculture': {'agriculture', 'farming', 'farm', 'crop', 'agritech', 'livestock', 'food'},
+    'energy': {
+        'energy', 'climate', 'solar', 'wind', 'grid', 'battery', 'batteries', 'renewable',
+        'oil', 'carbon', 'sustainability',
+    },
+    'transport': {
+        'transport', 'transportation', 'logistics', 'automotive', 'vehicle', 'car', 'aviation',
+        'shipping', 'mobility', 'driving',
+    },
+    'sports': {'sport', 'fitness', 'football', 'soccer', 'basketball', 'athletic', 'athletics'},
+    'retail': {'retail', 'ecommerce', 'shopping', 'marketing', 'advertising', 'customer'},
+    'legal': {'law', 'legal', 'legaltech', 'compliance', 'regulation'},
+    'manufacturing': {'manufacturing', 'robotics', 'industrial', 'factory', 'construction'},
+}
+
+
+def _domains(tokens):
+    """Subject areas a topic's words belong to (plural forms included)"""
+    domains = set()
+    for token in tokens:
+        forms = {token, token[:-1]} if token.endswith('s') else {token}
+        domains.update(name for name, words in TOPIC_DOMAINS.items() if forms & words)
+    return domains
+
+
+def _similarity(tokens_a, tokens_b, domain_bonus=0.25):
+    """
+    Jaccard similarity of two topics' words (stopwords removed), plus a
+    small bonus when they already share a word and are in the same subject
+    area. The bonus alone never relates topics with no words in common
+    """
+    if not tokens_a or not tokens_b:
+        return 0.0
+    overlap = len(tokens_a & tokens_b) / len(tokens_a | tokens_b)
+    if overlap and _domains(tokens_a) & _domains(tokens_b):
+        overlap += domain_bonus
+    return min(1.0, overlap)
+
+
+def cluster_topics(topics, threshold=0.55, max_cluster_size=5):
+    """
+    Group related topics with average-link agglomerative clustering.
+
+    Two clusters are merged while their average pairwise similarity is at
+    least threshold. A shared lead-in alone ("AI in finance", "AI in
+    music") stays below the default threshold, while the same lead-in
+    within one field ("AI in radiology", "AI in pathology") or a shared
+    subject ("quantum computing", "quantum computing hardware") is above it.
+    """
+    unique_topics = list(dict.fromkeys(topic.strip() for topic in topics if topic.strip()))
+    tokens = {topic: set(tokenize(topic)) for topic in unique_topics}
+    clusters = [[topic] for topic in unique_topics]
+
+    def linkage(a, b):
+        pairs = [_similarity(tokens[x], tokens[y]) for x in a for y in b]
+        return sum(pairs) / len(pairs)
+
+    while len(clusters) > 1:
+        best = None
+        for i in range(len(clusters)):
+            for j in range(i + 1, len(clusters)):
+                if len(clusters[i]) + len(clusters[j]) > max_cluster_size:
+                    continue
+                score = linkage(clusters[i], clusters[j])
+                if score >= threshold and (best is None or score > best[0]):
+                    best = (score, i, j)
+        if best is None:
+            break
+        _, i, j = best
+        clusters[i] = clusters[i] + clusters[j]
+        del clusters[j]
+
+    return clusters
+
+
+def umbrella_topic(cluster):
+    """
+    Describe a cluster as one research topic, e.g.
+    ["AI in radiology", "AI in pathology"] -> "AI in radiology and pathology"
+    """
+    if len(cluster) == 1:
+        return cluster[0]
+
+    words = [topic.split() for topic in cluster]
+    prefix = []
+    for column in zip(*words):
+        if len({word.lower() for word in column}) != 1:
+            break
+        prefix.append(column[0])
+
+    remainders = [' '.join(topic_words[len(prefix):]) for topic_words in words]
+    if prefix and not all(remainders):
+        # One topic is the shared prefix itself and already covers the rest
+        return ' '.join(prefix)
+    if not prefix:
+        remainders = cluster
+
+    joined = ', '.join(remainders[:-1]) + ' and ' + remainders[-1]
+    return f"{' '.join(prefix)} {joined}".strip()
+
+
+def plan_batch(topics, threshold=0.55, max_cluster_size=5):
+    """Return [(umbrella topic, [topics])] for a batch of topics"""
+    return [
+        (umbrella_topic(cluster), cluster)
+        for cluster in cluster_topics(topics, threshold, max_cluster_size)
+    ]
+
+
+def _research(umbrella):
+    """Run research_task once for a cluster's umbrella topic"""
+    from crewai import Crew, Process
+    from agents import create_news_researcher
+    from tasks import create_research_task
+    from tools import search_topic
+
+    researcher = create_news_researcher()
+    crew = Crew(
+        agents=[researcher],
+        tasks=[create_research_task(researcher)],
+        process=Process.sequential,
+        verbose=verbose_enabled()
+    )
+    log.info('batch_research_started', f"🔍 Researching cluster: {umbrella}", umbrella=umbrella)
+    with search_topic(umbrella):
+        report = crew.kickoff(inputs={'topic': umbrella})
+    log.info('batch_research_completed', f"📚 Research ready: {umbrella}", umbrella=umbrella)
+    return str(report)
+
+
+def _write(topic, report, output_dir):
+    """Run write_task for one topic using its cluster's shared report"""
+    from crewai import Crew, Process
+    from agents import create_news_writer
+    from tasks import create_write_task
+    from tools import search_topic
+
+    output_file = os.path.join(output_dir, f"{slugify(topic)}.md") if output_dir else None
+    writer = create_news_writer()
+    crew = Crew(
+        agents=[writer],
+        tasks=[create_write_task(writer, output_file=output_file, with_report=True)],
+        process=Process.sequential,
+        verbose=verbose_enabled()
+    )
+    with search_topic(topic):
+        article = crew.kickoff(inputs={'topic': topic, 'research_report': report})
+    log.info('batch_article_completed', f"✍️  Article ready: {topic}", topic=topic, path=output_file)
+    return str(article)
+
+
+def _submit(pool, fn, *args):
+    # Carry the run ID (and any other context) into the worker thread
+    context = contextvars.copy_context()
+    return pool.submit(context.run, fn, *args)
+
+
+def run_batch(topics, output_dir='batch-output', max_workers=4, threshold=0.55, max_cluster_size=5):
+    """
+    Research each topic cluster once, then write every topic's article
+    concurrently from its cluster's shared report.
+
+    Returns a dict mapping each topic to its article (None if it failed).
+    """
+    from crew import check_requirements
+
+    with run_context() as batch_id:
+        try:
+            plan = plan_batch(topics, threshold, max_cluster_size)
+            topic_count = sum(len(cluster) for _, cluster in plan)
+            log.info(
+                'batch_planned',
+                f"🗂️  {topic_count} topics grouped into {len(plan)} research clusters",
+                clusters=[{'umbrella': umbrella, 'topics': cluster} for umbrella, cluster in plan]
+            )
+            if not plan or not check_requirements():
+                return {}
+
+            if output_dir:
+                os.makedirs(output_dir, exist_ok=True)
+
+            start_time = time.time()
+            results = {}
+            with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='batch') as pool:
+                research_futures = {
+                    _submit(pool, _research, umbrella): (umbrella, cluster)
+                    for umbrella, cluster in plan
+                }
+                write_futures = {}
+                for future in as_completed(research_futures):
+                    umbrella, cluster = research_futures[future]
+                    try:
+                        report = future.result()
+                    except Exception as e:
+                        log.error(
+                            'batch_research_failed',
+                            f"❌ Research failed for {umbrella}: {e}",
+                            umbrella=umbrella, error=str(e)
+                        )
+                        results.update({topic: None for topic in cluster})
+                        continue
+                    for topic in cluster:
+                        write_futures[_submit(pool, _write, topic, report, output_dir)] = topic
+
+                for future in as_completed(write_futures):
+                    topic = write_futures[future]
+                    try:
+                        results[topic] = future.result()
+                    except Exception as e:
+                        log.error('batch_write_failed', f"❌ Writing failed for {topic}: {e}", topic=topic, error=str(e))
+                        results[topic] = None
+
+            log.info(
+                'batch_completed',
+                f"✅ Batch completed in {time.time() - start_time:.2f} seconds: "
+                f"{sum(1 for r in results.values() if r)}/{topic_count} articles, "
+                f"{len(plan)} research runs instead of {topic_count}",
+                batch_id=batch_id,
+                research_runs=len(plan),
+                topics=topic_count
+            )
+            return results
+        finally:
+            log.flush()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Research and write articles for a batch of topics")
+    parser.add_argument('topics', nargs='*', help="Topics to write about")
+    parser.add_argument('--file', help="Text file with one topic per line")
+    parser.add_argument('--output-dir', default='batch-output', help="Directory for the generated articles")
+    parser.add_argument('--workers', type=int, default=4, help="Maximum concurrent crew runs")
+    parser.add_argument('--threshold', type=float, default=0.55, help="Topic similarity needed to share research (0-1)")
+    parser.add_argument('--max-cluster-size', type=int, default=5, help="Maximum topics sharing one research run")
+    parser.add_argument('--plan-only', action='store_true', help="Only print the research clusters")
+    args = parser.parse_args()
+
+    topics = list(args.topics)
+    if args.file:
+        with open(args.file, 'r', encoding='utf-8') as f:
+            topics.extend(line.strip() for line in f if line.strip())
+    if not topics:
+        parser.error("no topics given")
+
+    if args.plan_only:
+        for umbrella, cluster in plan_batch(topics, args.threshold, args.max_cluster_size):
+            print(f"🔍 {umbrella}")
+            for topic in cluster:
+                print(f"   ✍️  {topic}")
+        return
+
+    results = run_batch(
+        topics,
+        output_dir=args.output_dir,
+        max_workers=args.workers,
+        threshold=args.threshold,
+        max_cluster_size=args.max_cluster_size
+    )
+    if not results or not all(results.values()):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
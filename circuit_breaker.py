@@ -0,0 +1,156 @@
+"""
+Circuit breaker for AI Research & Writing Crew
+Bounds the time spent on a failing dependency and remembers results for fallback
+"""
+
+import threading
+import time
+from collections import OrderedDict
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling the dependency while the breaker is open"""
+
+
+class CallTimeoutError(TimeoutError):
+    """Raised by a protected call that did not finish within its timeout"""
+
+
+class CircuitBreaker:
+    """
+    Closed / open / half-open circuit breaker.
+
+    After failure_threshold consecutive failures the breaker opens and
+    calls fail fast with CircuitOpenError. Once recovery_timeout seconds
+    have passed it lets half_open_max_calls trial calls through: a success
+    closes it again, a failure re-opens it.
+
+    Calls run on the caller's thread, so the protected function must bound
+    its own duration (e.g. an HTTP timeout); a TimeoutError it raises is
+    counted as a timeout as well as a failure.
+    """
+
+    def __init__(self, name, failure_threshold=3, recovery_timeout=30.0, half_open_max_calls=1):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.half_open_max_calls = half_open_max_calls
+        self._lock = threading.Lock()
+        self._state = CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._half_open_calls = 0
+        self._stats = {
+            'calls': 0,
+            'successes': 0,
+            'failures': 0,
+            'timeouts': 0,
+            'rejected': 0,
+            'opened': 0,
+        }
+
+    @property
+    def state(self):
+        with self._lock:
+            return self._current_state()
+
+    def _current_state(self):
+        if self._state == OPEN and time.monotonic() - self._opened_at >= self.recovery_timeout:
+            self._state = HALF_OPEN
+            self._half_open_calls = 0
+        return self._state
+
+    def _before_call(self):
+        with self._lock:
+            self._stats['calls'] += 1
+            state = self._current_state()
+            if state == OPEN:
+                self._stats['rejected'] += 1
+                raise CircuitOpenError(f"{self.name} circuit is open")
+            if state == HALF_OPEN:
+                if self._half_open_calls >= self.half_open_max_calls:
+                    self._stats['rejected'] += 1
+                    raise CircuitOpenError(f"{self.name} circuit is half-open and a trial call is running")
+                self._half_open_calls += 1
+
+    def _on_success(self):
+        with self._lock:
+            self._stats['successes'] += 1
+            self._failures = 0
+            self._state = CLOSED
+
+    def _on_failure(self):
+        with self._lock:
+            self._stats['failures'] += 1
+            self._failures += 1
+            if self._state == HALF_OPEN or self._failures >= self.failure_threshold:
+                if self._state != OPEN:
+                    self._stats['opened'] += 1
+                self._state = OPEN
+                self._opened_at = time.monotonic()
+
+    def call(self, fn, *args, is_failure=None, **kwargs):
+        """
+        Call fn through the breaker. is_failure(result) can flag results
+        that did not raise but should still count as failures.
+        """
+        self._before_call()
+
+        try:
+            result = fn(*args, **kwargs)
+        except Exception as e:
+            if isinstance(e, TimeoutError):
+                with self._lock:
+                    self._stats['timeouts'] += 1
+            self._on_failure()
+            raise
+
+        if is_failure is not None and is_failure(result):
+            self._on_failure()
+        else:
+            self._on_success()
+        return result
+
+    def get_stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+            stats['state'] = self._current_state()
+            stats['consecutive_failures'] = self._failures
+        stats['name'] = self.name
+        return stats
+
+
+class StaleCache:
+    """Bounded LRU of last known good results, served when live calls fail"""
+
+    def __init__(self, max_entries=256):
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+
+    def put(self, key, value):
+        with self._lock:
+            self._entries[key] = (value, time.time())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def get(self, key):
+        """Return (value, age in seconds) or None"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            self._entries.move_to_end(key)
+        value, stored_at = entry
+        return value, time.time() - stored_at
+
+
+__all__ = [
+    'CircuitBreaker', 'CircuitOpenError', 'CallTimeoutError', 'StaleCache',
+    'CLOSED', 'OPEN', 'HALF_OPEN',
+]
@@ -1,11 +1,15 @@
 
+import argparse
 import os
-import sys
 from datetime import datetime
 from dotenv import load_dotenv
 
+from event_log import get_event_log, run_context, verbose_enabled
+
 load_dotenv()
 
+log = get_event_log()
+
 def check_requirements():
     """Check if all requirements are met before running the crew"""
     try:
@@ -14,92 +18,218 @@ def check_requirements():
         from agents import news_researcher, news_writer
         from tools import validate_api_keys
         
-        print("✅ All modules imported successfully")
+        log.info('modules_imported', "✅ All modules imported successfully")
         
         # Validate API keys
         if not validate_api_keys():
-            print("❌ API key validation failed")
+            log.error('api_key_validation_failed', "❌ API key validation failed")
             return False
         
         return True
         
     except ImportError as e:
-        print(f"❌ Import error: {e}")
-        print("Please ensure all required packages are installed:")
-        print("pip install -r requirements.txt")
+        log.error(
+            'import_error',
+            f"❌ Import error: {e}\n"
+            "Please ensure all required packages are installed:\n"
+            "pip install -r requirements.txt",
+            error=str(e)
+        )
         return False
     except Exception as e:
-        print(f"❌ Setup error: {e}")
+        log.error('setup_error', f"❌ Setup error: {e}", error=str(e))
         return False
 
-def create_crew(verbose=True):
-    """Create and configure the crew"""
+def create_crew(verbose=None):
+    """
+    Create and configure the crew. Agents and tasks are built fresh for
+    every crew because crewai mutates them while running, which breaks
+    concurrent runs that share them
+    """
+    if verbose is None:
+        verbose = verbose_enabled()
     try:
         from crewai import Crew, Process
-        from tasks import research_task, write_task
-        from agents import news_researcher, news_writer
+        from tasks import create_research_task, create_write_task
+        from agents import create_news_researcher, create_news_writer
         
+        researcher = create_news_researcher()
+        writer = create_news_writer()
         crew = Crew(
-            agents=[news_researcher, news_writer],
-            tasks=[research_task, write_task],
+            agents=[researcher, writer],
+            tasks=[create_research_task(researcher), create_write_task(writer)],
             process=Process.sequential,
             verbose=verbose
         )
         
-        print("✅ Crew created successfully")
+        log.info('crew_created', "✅ Crew created successfully")
         return crew
         
     except Exception as e:
-        print(f"❌ Error creating crew: {e}")
+        log.error('crew_create_failed', f"❌ Error creating crew: {e}", error=str(e))
         return None
 
-def run_crew(topic, verbose=True, output_file=None):
-    """Run the crew with the specified topic"""
-    print(f"\n🚀 Starting AI Research & Writing Crew")
-    print(f"📝 Topic: {topic}")
-    print(f"🕐 Started at: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-    print("-" * 50)
+def research_structured(topic, verbose=None, refresh=False):
+    """
+    Return the structured ResearchReport for a topic, reusing the stored
+    report unless refresh is set
+    """
+    from crewai import Crew, Process
+    from agents import create_news_researcher
+    from tasks import create_research_task
+    from research_report import load_report, parse_report, report_path, save_report
+    
+    if not refresh:
+        report = load_report(topic)
+        if report:
+            log.info('research_reused', f"♻️  Reusing stored research: {report_path(topic)}", topic=topic)
+            return report
+    
+    researcher = create_news_researcher()
+    crew = Crew(
+        agents=[researcher],
+        tasks=[create_research_task(researcher, structured=True)],
+        process=Process.sequential,
+        verbose=verbose_enabled() if verbose is None else verbose
+    )
+    report = parse_report(crew.kickoff(inputs={'topic': topic}))
+    report.topic = topic
+    path = save_report(report)
+    log.info('research_saved', f"📚 Research report saved to: {path}", topic=topic, path=path)
+    return report
+
+def write_from_report(topic, report, verbose=None, output_file='new-blog-post.md'):
+    """Run the writer on a structured report passed as compact JSON"""
+    from crewai import Crew, Process
+    from agents import create_news_writer
+    from tasks import create_write_task
+    from research_report import to_prompt_json
+    
+    writer = create_news_writer()
+    crew = Crew(
+        agents=[writer],
+        tasks=[create_write_task(writer, output_file=output_file, with_report=True)],
+        process=Process.sequential,
+        verbose=verbose_enabled() if verbose is None else verbose
+    )
+    return crew.kickoff(inputs={'topic': topic, 'research_report': to_prompt_json(report)})
+
+def run_crew(topic, verbose=None, output_file=None, structured=False, refresh_research=False,
+             profile=False):
+    """
+    Run the crew with the specified topic. With structured=True the
+    researcher produces a JSON report (stored under research/ and reused on
+    later runs unless refresh_research is set) which the writer consumes.
+    With profile=True a CPU sample profile and allocation snapshot of the
+    run are written to a profiles/ directory next to the article.
+    """
+    with run_context() as run_id:
+        try:
+            if not profile:
+                return _run_crew(topic, verbose, output_file, structured, refresh_research)
+            
+            from profiling import RunProfiler
+            profile_dir = os.path.join(
+                os.path.dirname(os.path.abspath(output_file or 'new-blog-post.md')), 'profiles'
+            )
+            with RunProfiler(profile_dir, f"profile-{run_id}") as profiler:
+                result = _run_crew(topic, verbose, output_file, structured, refresh_research)
+            log.info(
+                'profile_written',
+                f"🔬 Profile summary:\n{profiler.summary}\n"
+                f"📁 Profile files: {', '.join(profiler.files.values())}",
+                files=profiler.files
+            )
+            return result
+        finally:
+            log.flush()
+
+def _run_crew(topic, verbose, output_file, structured, refresh_research):
+    log.info(
+        'run_started',
+        f"\n🚀 Starting AI Research & Writing Crew\n"
+        f"📝 Topic: {topic}\n"
+        f"🕐 Started at: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n"
+        + "-" * 50,
+        topic=topic
+    )
     
     # Check requirements
     if not check_requirements():
         return None
     
-    # Create crew
-    crew = create_crew(verbose=verbose)
-    if not crew:
-        return None
+    # Create crew (the structured mode builds its own per-step crews)
+    if not structured:
+        crew = create_crew(verbose=verbose)
+        if not crew:
+            return None
     
     try:
         # Execute the crew
-        print("🔄 Executing crew tasks...")
+        log.info('crew_executing', "🔄 Executing crew tasks...")
         start_time = datetime.now()
         
-        result = crew.kickoff(inputs={'topic': topic})
+        from singleflight import get_coalescing_stats
+        from hedging import get_hedging_stats
+        coalescing_before = get_coalescing_stats()
+        hedging_before = get_hedging_stats()
+        
+        from tools import search_topic
+        with search_topic(topic):
+            if structured:
+                report = research_structured(topic, verbose=verbose, refresh=refresh_research)
+                result = write_from_report(topic, report, verbose=verbose)
+            else:
+                result = crew.kickoff(inputs={'topic': topic})
         
         end_time = datetime.now()
         execution_time = (end_time - start_time).total_seconds()
         
-        print("-" * 50)
-        print(f"✅ Crew execution completed!")
-        print(f"⏱️  Execution time: {execution_time:.2f} seconds")
-        print(f"🕐 Completed at: {end_time.strftime('%Y-%m-%d %H:%M:%S')}")
-        
+        log.info(
+            'run_completed',
+            "-" * 50 + "\n"
+            f"✅ Crew execution completed!\n"
+            f"⏱️  Execution time: {execution_time:.2f} seconds\n"
+            f"🕐 Completed at: {end_time.strftime('%Y-%m-%d %H:%M:%S')}",
+            execution_time=execution_time,
+            events_dropped_total=log.dropped
+        )
+
+        # Report how many searches/LLM calls were shared with concurrent runs
+        # while this one was executing (counters are process-wide)
+        for name, stats in get_coalescing_stats(since=coalescing_before).items():
+            log.info(
+                'coalescing_stats',
+                f"🔁 {name}: {stats['coalesced']}/{stats['calls']} requests coalesced during this run "
+                f"(process-wide, including overlapping runs)",
+                **stats
+            )
+
+        hedging_stats = get_hedging_stats(since=hedging_before)
+        if hedging_stats:
+            log.info(
+                'hedging_stats',
+                f"🏁 llm hedging: {hedging_stats['hedged']}/{hedging_stats['calls']} calls hedged, "
+                f"{hedging_stats['hedges_won']} won by the hedge during this run (process-wide)",
+                **hedging_stats
+            )
+
         # Save to file if specified
         if output_file:
             try:
                 with open(output_file, 'w', encoding='utf-8') as f:
                     f.write(str(result))
-                print(f"💾 Result saved to: {output_file}")
+                log.info('result_saved', f"💾 Result saved to: {output_file}", path=output_file)
             except Exception as e:
-                print(f"⚠️  Warning: Could not save to file: {e}")
+                log.warning('result_save_failed', f"⚠️  Warning: Could not save to file: {e}", error=str(e))
         
         return result
         
     except KeyboardInterrupt:
-        print("\n⏹️  Execution interrupted by user")
+        log.warning('run_interrupted', "\n⏹️  Execution interrupted by user")
         return None
     except Exception as e:
-        print(f"❌ Error during execution: {e}")
+        log.error('run_failed', f"❌ Error during execution: {e}", error=str(e))
         return None
 
 def main():
@@ -111,9 +241,19 @@ def main():
     default_topic = "AI in healthcare"
     default_output_file = "new-blog-post.md"
     
+    parser = argparse.ArgumentParser(description="Research a topic and write an article about it")
+    parser.add_argument('topic', nargs='*', help="Research topic (prompted for if omitted)")
+    parser.add_argument('--structured', action='store_true',
+                        help="Pass research to the writer as a stored, validated JSON report")
+    parser.add_argument('--refresh-research', action='store_true',
+                        help="With --structured, re-run research even if a stored report exists")
+    parser.add_argument('--profile', action='store_true',
+                        help="Write a CPU sample profile and allocation snapshot of the run")
+    args = parser.parse_args()
+    
     # Check for command line arguments
-    if len(sys.argv) > 1:
-        topic = " ".join(sys.argv[1:])
+    if args.topic:
+        topic = " ".join(args.topic)
     else:
         # Interactive mode
         try:
@@ -138,7 +278,13 @@ def main():
         return
     
     # Run the crew
-    result = run_crew(topic, verbose=True, output_file=output_file)
+    result = run_crew(
+        topic,
+        output_file=output_file,
+        structured=args.structured,
+        refresh_research=args.refresh_research,
+        profile=args.profile
+    )
     
     if result:
         print("\n📄 Generated Article:")
@@ -168,11 +314,11 @@ else:
             agents=[news_researcher, news_writer],
             tasks=[research_task, write_task],
             process=Process.sequential,
-            verbose=True
+            verbose=verbose_enabled()
         )
         
-        print("✅ Crew module loaded successfully")
+        log.info('crew_module_loaded', "✅ Crew module loaded successfully")
         
     except Exception as e:
-        print(f"⚠️  Warning: Could not initialize crew module: {e}")
+        log.warning('crew_module_failed', f"⚠️  Warning: Could not initialize crew module: {e}", error=str(e))
         crew = None
\ No newline at end of file
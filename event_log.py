@@ -0,0 +1,261 @@
+"""
+Structured event logging for AI Research & Writing Crew
+Buffers JSON-lines events and writes them from a background thread
+"""
+
+import atexit
+import contextlib
+import contextvars
+import json
+import os
+import queue
+import random
+import sys
+import threading
+import time
+import uuid
+
+LEVELS = {'DEBUG': 10, 'INFO': 20, 'WARNING': 30, 'ERROR': 40}
+
+# Correlation ID of the run the current thread/context is working on
+_run_id = contextvars.ContextVar('run_id', default=None)
+
+_STOP = object()
+
+
+_TRUE = ('1', 'true', 'yes', 'on')
+_FALSE = ('0', 'false', 'no', 'off')
+
+
+def env_flag(name, default=False):
+    """Read a boolean setting; unset or unrecognised values give default"""
+    value = os.getenv(name, '').strip().lower()
+    if value in _TRUE:
+        return True
+    if value in _FALSE:
+        return False
+    return default
+
+
+def _level_value(name, default):
+    return LEVELS.get(str(name).upper(), LEVELS[default])
+
+
+def verbose_enabled():
+    """Whether crewai/langchain should print their own ReAct traces (CREW_VERBOSE)"""
+    return env_flag('CREW_VERBOSE')
+
+
+class EventLog:
+    """
+    JSON-lines event sink with levels, run correlation IDs and bounded buffering.
+
+    Callers only enqueue events; a daemon thread serialises them, appends
+    them to the log file and echoes the human readable message to the
+    console. When the buffer is full new events are dropped (and counted)
+    instead of blocking the crew.
+    """
+
+    def __init__(self, path=None, level=None, console_level=None,
+                 buffer_size=None, max_payload_chars=None, sample_rate=None):
+        self.path = path or os.getenv('CREW_LOG_FILE', os.path.join('logs', 'events.jsonl'))
+        self.level = _level_value(level or os.getenv('CREW_LOG_LEVEL', 'INFO'), 'INFO')
+        self.console_level = _level_value(
+            console_level or os.getenv('CREW_CONSOLE_LEVEL', 'INFO'), 'INFO'
+        )
+        self.max_payload_chars = int(max_payload_chars or os.getenv('CREW_LOG_MAX_PAYLOAD', '2000'))
+        self.sample_rate = float(
+            sample_rate if sample_rate is not None else os.getenv('CREW_LOG_SAMPLE_RATE', '0.05')
+        )
+        self._dropped = 0
+        self._dropped_lock = threading.Lock()
+        self._queue = queue.Queue(maxsize=int(buffer_size or os.getenv('CREW_LOG_BUFFER', '10000')))
+        self._thread = threading.Thread(target=self._writer, name='event-log-writer', daemon=True)
+        self._thread.start()
+
+    # ------------------------------------------------------------------
+    # Producer side
+    # ------------------------------------------------------------------
+    def log(self, level, event, message=None, **fields):
+        """Queue an event; never blocks the calling thread"""
+        value = _level_value(level, 'INFO')
+        if value < self.level and value < self.console_level:
+            return
+
+        record = {
+            'ts': time.time(),
+            'level': level.upper(),
+            'event': event,
+            'run_id': _run_id.get(),
+            'thread': threading.current_thread().name,
+        }
+        if message is not None:
+            record['message'] = message
+        for key, field in fields.items():
+            record[key] = self._sample(field)
+
+        try:
+            self._queue.put_nowait((value, record))
+        except queue.Full:
+            self._count_dropped(1)
+
+    def debug(self, event, message=None, **fields):
+        self.log('DEBUG', event, message, **fields)
+
+    def info(self, event, message=None, **fields):
+        self.log('INFO', event, message, **fields)
+
+    def warning(self, event, message=None, **fields):
+        self.log('WARNING', event, message, **fields)
+
+    def error(self, event, message=None, **fields):
+        self.log('ERROR', event, message, **fields)
+
+    def _count_dropped(self, count):
+        with self._dropped_lock:
+            self._dropped += count
+
+    @property
+    def dropped(self):
+        """Events lost because the buffer was full or the file could not be written"""
+        with self._dropped_lock:
+            return self._dropped
+
+    def _sample(self, value):
+        """Keep a sample of large payloads in full and truncate the rest"""
+        if not isinstance(value, str):
+            return value
+        if len(value) <= self.max_payload_chars or random.random() < self.sample_rate:
+            return value
+        dropped = len(value) - self.max_payload_chars
+        return f"{value[:self.max_payload_chars]}...[truncated {dropped} chars]"
+
+    def flush(self, timeout=5.0):
+        """Wait until every queued event has been written"""
+        deadline = time.time() + timeout
+        while self._queue.unfinished_tasks and time.time() < deadline:
+            time.sleep(0.01)
+
+    def close(self):
+        """Flush the buffer, stop the writer thread and report any dropped events"""
+        if not self._thread.is_alive():
+            return
+        try:
+            self._queue.put(_STOP, timeout=1.0)
+        except queue.Full:
+            pass
+        else:
+            self._thread.join(timeout=5.0)
+        if self.dropped:
+            print(
+                f"⚠️  Event log dropped {self.dropped} events (buffer full or {self.path} not writable); "
+                "raise CREW_LOG_BUFFER or CREW_LOG_LEVEL",
+                file=sys.stderr
+            )
+
+    # ------------------------------------------------------------------
+    # Writer thread
+    # ------------------------------------------------------------------
+    def _writer(self):
+        handle = None
+        while True:
+            item = self._queue.get()
+            batch = [item]
+            # Drain whatever else is pending so it is written in one go
+            while len(batch) < 500:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            stop = False
+            lines = []
+            for entry in batch:
+                if entry is _STOP:
+                    stop = True
+                    continue
+                value, record = entry
+                if value >= self.console_level and record.get('message'):
+                    print(record['message'], file=sys.stderr if value >= LEVELS['ERROR'] else sys.stdout)
+                if value >= self.level:
+                    lines.append(json.dumps(record, default=str, ensure_ascii=False))
+
+            if lines:
+                try:
+                    if handle is None:
+                        directory = os.path.dirname(self.path)
+                        if directory:
+                            os.makedirs(directory, exist_ok=True)
+                        handle = open(self.path, 'a', encoding='utf-8')
+                    handle.write('\n'.join(lines) + '\n')
+                    handle.flush()
+                except OSError:
+                    self._count_dropped(len(lines))
+
+            for _ in batch:
+                self._queue.task_done()
+
+            if stop:
+                if handle is not None:
+                    handle.close()
+                return
+
+
+_event_log = None
+_event_log_lock = threading.Lock()
+
+
+def get_event_log():
+    """Return the process-wide event log, starting its writer on first use"""
+    global _event_log
+    with _event_log_lock:
+        if _event_log is None:
+            _event_log = EventLog()
+            atexit.register(_event_log.close)
+        return _event_log
+
+
+def current_run_id():
+    return _run_id.get()
+
+
+@contextlib.contextmanager
+def run_context(run_id=None):
+    """Tag every event logged inside the block with a run correlation ID"""
+    run_id = run_id or uuid.uuid4().hex[:12]
+    token = _run_id.set(run_id)
+    try:
+        yield run_id
+    finally:
+        _run_id.reset(token)
+
+
+def log_agent_step(step_output):
+    """crewai step_callback: record ReAct steps as events instead of stdout traces"""
+    # Logged without a message so traces reach the file but not the console
+    log = get_event_log()
+    steps = step_output if isinstance(step_output, list) else [step_output]
+    for step in steps:
+        if isinstance(step, tuple) and len(step) == 2:
+            action, observation = step
+            log.info(
+                'agent_action',
+                tool=getattr(action, 'tool', None),
+                tool_input=str(getattr(action, 'tool_input', '')),
+                thought=getattr(action, 'log', ''),
+                observation=str(observation),
+            )
+        elif hasattr(step, 'return_values'):
+            log.info(
+                'agent_finish',
+                output=str(step.return_values.get('output', '')),
+                thought=getattr(step, 'log', ''),
+            )
+        else:
+            log.info('agent_step', step=str(step))
+
+
+__all__ = [
+    'EventLog', 'get_event_log', 'run_context', 'current_run_id',
+    'log_agent_step', 'verbose_enabled', 'env_flag',
+]
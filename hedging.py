@@ -0,0 +1,204 @@
+"""
+Hedged requests for AI Research & Writing Crew
+Issues a duplicate LLM call when the first one is slower than usual
+"""
+
+import contextvars
+import functools
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, wait
+
+from event_log import env_flag
+from metrics import percentile
+
+
+class LatencyWindow:
+    """Sliding window of recent call latencies"""
+
+    def __init__(self, size=200):
+        self._lock = threading.Lock()
+        self._samples = deque(maxlen=size)
+
+    def add(self, seconds):
+        with self._lock:
+            self._samples.append(seconds)
+
+    def __len__(self):
+        with self._lock:
+            return len(self._samples)
+
+    def percentile(self, pct):
+        with self._lock:
+            samples = list(self._samples)
+        return percentile(samples, pct)
+
+
+class HedgedCaller:
+    """
+    Hedge slow calls: if a call has not returned after the pct-th percentile
+    of recently observed latency, start a duplicate and return whichever
+    finishes first.
+
+    Hedging only starts once min_samples latencies have been seen and is
+    capped so that at most max_hedge_rate of calls are duplicated. Each
+    attempt runs on its own thread rather than a bounded pool, so calls
+    never queue behind each other and latency is measured from when fn
+    actually starts. The losing call cannot be interrupted, so its result
+    is discarded.
+    """
+
+    def __init__(self, name, percentile=95.0, min_samples=20, max_hedge_rate=0.1,
+                 min_delay=0.5, window_size=200):
+        self.name = name
+        self.percentile = percentile
+        self.min_samples = min_samples
+        self.max_hedge_rate = max_hedge_rate
+        self.min_delay = min_delay
+        self.latencies = LatencyWindow(window_size)
+        self._lock = threading.Lock()
+        self._stats = {
+            'calls': 0,
+            'hedged': 0,
+            'hedges_won': 0,
+            'rate_limited': 0,
+            'errors': 0,
+        }
+
+    def hedge_delay(self):
+        """Seconds to wait before hedging, or None while warming up"""
+        if len(self.latencies) < self.min_samples:
+            return None
+        return max(self.min_delay, self.latencies.percentile(self.percentile))
+
+    def _start(self, fn, *args, **kwargs):
+        """Run fn on a new thread and return a Future for its result"""
+        future = Future()
+        context = contextvars.copy_context()
+
+        def run():
+            future.set_running_or_notify_cancel()
+            started = time.monotonic()
+            try:
+                result = context.run(fn, *args, **kwargs)
+            except BaseException as e:
+                future.set_exception(e)
+                return
+            self.latencies.add(time.monotonic() - started)
+            future.set_result(result)
+
+        threading.Thread(target=run, name=f'{self.name}-hedge', daemon=True).start()
+        return future
+
+    def _may_hedge(self):
+        with self._lock:
+            if self._stats['hedged'] + 1 > self.max_hedge_rate * self._stats['calls']:
+                self._stats['rate_limited'] += 1
+                return False
+            self._stats['hedged'] += 1
+            return True
+
+    def call(self, fn, *args, **kwargs):
+        with self._lock:
+            self._stats['calls'] += 1
+
+        delay = self.hedge_delay()
+        if delay is None:
+            started = time.monotonic()
+            result = fn(*args, **kwargs)
+            self.latencies.add(time.monotonic() - started)
+            return result
+
+        primary = self._start(fn, *args, **kwargs)
+        done, _ = wait([primary], timeout=delay)
+        if done or not self._may_hedge():
+            return self._result(primary)
+
+        hedge = self._start(fn, *args, **kwargs)
+        pending = {primary, hedge}
+        first_error = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is not None:
+                    first_error = first_error or future.exception()
+                    continue
+                if future is hedge:
+                    with self._lock:
+                        self._stats['hedges_won'] += 1
+                return future.result()
+
+        with self._lock:
+            self._stats['errors'] += 1
+        raise first_error
+
+    def _result(self, future):
+        try:
+            return future.result()
+        except Exception:
+            with self._lock:
+                self._stats['errors'] += 1
+            raise
+
+    def get_stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+        stats['name'] = self.name
+        stats['hedge_delay'] = self.hedge_delay()
+        stats['hedge_win_ratio'] = stats['hedges_won'] / stats['hedged'] if stats['hedged'] else 0.0
+        return stats
+
+
+def is_enabled():
+    """Hedging is opt-in with CREW_LLM_HEDGING=1"""
+    return env_flag('CREW_LLM_HEDGING')
+
+
+llm_hedger = HedgedCaller(
+    'llm',
+    percentile=float(os.getenv('CREW_LLM_HEDGE_PERCENTILE', '95')),
+    min_samples=int(os.getenv('CREW_LLM_HEDGE_MIN_SAMPLES', '20')),
+    max_hedge_rate=float(os.getenv('CREW_LLM_HEDGE_MAX_RATE', '0.1')),
+    min_delay=float(os.getenv('CREW_LLM_HEDGE_MIN_DELAY', '0.5')),
+)
+
+
+def hedge(obj, method_name, caller):
+    """
+    Route obj.method_name through a HedgedCaller.
+
+    Installed with object.__setattr__ like singleflight.coalesce so it
+    also works on pydantic models.
+    """
+    if obj is None or not is_enabled():
+        return obj
+
+    original = getattr(obj, method_name)
+
+    @functools.wraps(original)
+    def hedged(*args, **kwargs):
+        return caller.call(original, *args, **kwargs)
+
+    object.__setattr__(obj, method_name, hedged)
+    return obj
+
+
+def get_hedging_stats(since=None):
+    """
+    Metrics for the shared LLM hedger (None when hedging is off). Counters
+    are process totals; pass an earlier result as since to get only what
+    happened after it
+    """
+    if not is_enabled():
+        return None
+    stats = llm_hedger.get_stats()
+    if since:
+        for counter in ('calls', 'hedged', 'hedges_won', 'rate_limited', 'errors'):
+            stats[counter] -= since[counter]
+        stats['hedge_win_ratio'] = stats['hedges_won'] / stats['hedged'] if stats['hedged'] else 0.0
+    return stats
+
+
+__all__ = ['LatencyWindow', 'HedgedCaller', 'llm_hedger', 'hedge', 'get_hedging_stats']
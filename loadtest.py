@@ -0,0 +1,314 @@
+"""
+Load testing for AI Research & Writing Crew
+Drives run_crew or the Streamlit app with concurrent virtual users against
+local fake Gemini and Serper stand-ins
+"""
+
+import argparse
+import json
+import os
+import random
+import re
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from metrics import percentile
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+
+_TOPIC_RE = re.compile(r"(?:next big trend in|insightful article on) (.+?)\.")
+
+
+class FakeSerper:
+    """Local HTTP server answering like google.serper.dev/search"""
+
+    def __init__(self, latency=0.1, jitter=0.05, error_rate=0.0):
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.requests = 0
+        self._lock = threading.Lock()
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_POST(self):
+                length = int(self.headers.get('Content-Length', 0))
+                query = json.loads(self.rfile.read(length) or b'{}').get('q', '')
+                with fake._lock:
+                    fake.requests += 1
+                time.sleep(max(0.0, random.gauss(fake.latency, fake.jitter)))
+                if random.random() < fake.error_rate:
+                    body = {'message': 'Fake Serper error', 'statusCode': 500}
+                else:
+                    body = {'organic': [
+                        {
+                            'title': f"Fake result {i} about {query}",
+                            'link': f"https://example.com/{i}",
+                            'snippet': f"Fake result {i}: {query} is growing quickly. Analysts expect more adoption.",
+                        }
+                        for i in range(8)
+                    ]}
+                data = json.dumps(body).encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+        self._server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self._server.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self._server.server_port}/search"
+        threading.Thread(target=self._server.serve_forever, name='fake-serper', daemon=True).start()
+
+    def stop(self):
+        self._server.shutdown()
+
+
+def install_fake_gemini(latency=0.3, jitter=0.1, error_rate=0.0):
+    """
+    Replace Gemini calls with a local ReAct-speaking stand-in. Must run
+    before agents.py is imported so the wrapped llm picks it up.
+    """
+    from langchain_core.messages import AIMessage
+    from langchain_core.outputs import ChatGeneration, ChatResult
+    from langchain_google_genai import ChatGoogleGenerativeAI
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+        time.sleep(max(0.0, random.gauss(latency, jitter)))
+        if random.random() < error_rate:
+            raise RuntimeError("Fake Gemini error")
+
+        prompt = "\n".join(str(message.content) for message in messages)
+        match = _TOPIC_RE.search(prompt)
+        topic = match.group(1) if match else "technology trends"
+        if 'Fake result' in prompt or 'Web search is temporarily unavailable' in prompt:
+            text = (
+                "Thought: I now know the final answer\n"
+                f"Final Answer: # {topic}\n\n" + f"{topic} is advancing quickly. " * 3
+            )
+        else:
+            text = (
+                "Thought: I should search for recent information\n"
+                "Action: Search the internet\n"
+                f'Action Input: {{"search_query": "{topic} latest trends"}}'
+            )
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=text))])
+
+    ChatGoogleGenerativeAI._generate = _generate
+
+
+def rss_mb():
+    """Current resident set size in MB (peak RSS where /proc is unavailable)"""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / 1024 / 1024
+    except (OSError, ValueError, AttributeError):
+        # resource is Unix-only; Windows has neither it nor /proc
+        try:
+            import resource
+        except ImportError:
+            return 0.0
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak / 1024 / 1024 if sys.platform == 'darwin' else peak / 1024
+
+
+class ResourceSampler:
+    """Samples RSS and thread count in the background during a test"""
+
+    def __init__(self, interval=0.2):
+        self.interval = interval
+        self.rss = []
+        self.threads = []
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='loadtest-sampler', daemon=True)
+
+    def _run(self):
+        while not self._stop.is_set():
+            self.rss.append(rss_mb())
+            self.threads.append(threading.active_count())
+            self._stop.wait(self.interval)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+        self.rss.append(rss_mb())
+        self.threads.append(threading.active_count())
+
+
+def _crew_request(topic):
+    from crew import run_crew
+    if run_crew(topic) is None:
+        raise RuntimeError("run_crew returned no result")
+
+
+def _app_request(topic, timeout):
+    from streamlit.testing.v1 import AppTest
+
+    app = AppTest.from_file(os.path.join(APP_DIR, 'app.py'), default_timeout=timeout)
+    app.run()
+    next(widget for widget in app.text_input if widget.label == "Research Topic").input(topic)
+    next(widget for widget in app.button if "Start Research" in widget.label).click()
+    app.run()
+    if app.exception:
+        raise RuntimeError(app.exception[0].message)
+    errors = [element.value for element in app.error]
+    if errors:
+        raise RuntimeError(errors[0])
+    if app.session_state['execution_status'] != 'completed':
+        raise RuntimeError(f"execution status is {app.session_state['execution_status']}")
+
+
+def run_load_test(target='crew', users=10, iterations=1, ramp_up=0.0, topics=None, app_timeout=120):
+    """
+    Run users virtual users, each issuing iterations requests, and return
+    a report with latency percentiles, error rate, memory and thread counts.
+    """
+    topics = topics or ["AI in healthcare"]
+    latencies = []
+    errors = []
+    lock = threading.Lock()
+
+    def virtual_user(user):
+        if ramp_up:
+            time.sleep(ramp_up * user / max(1, users))
+        for iteration in range(iterations):
+            topic = topics[(user + iteration) % len(topics)]
+            started = time.perf_counter()
+            try:
+                if target == 'app':
+                    _app_request(topic, app_timeout)
+                else:
+                    _crew_request(topic)
+                ok = True
+            except Exception as e:
+                ok = False
+                with lock:
+                    errors.append(f"{type(e).__name__}: {e}")
+            with lock:
+                latencies.append((time.perf_counter() - started, ok))
+
+    threads_before = threading.active_count()
+    rss_before = rss_mb()
+    started = time.perf_counter()
+    with ResourceSampler() as sampler:
+        with ThreadPoolExecutor(max_workers=users, thread_name_prefix='vuser') as pool:
+            list(pool.map(virtual_user, range(users)))
+    wall_time = time.perf_counter() - started
+
+    ok_latencies = [seconds for seconds, ok in latencies if ok]
+    total = len(latencies)
+    return {
+        'target': target,
+        'users': users,
+        'requests': total,
+        'errors': len(errors),
+        'error_rate': len(errors) / total if total else 0.0,
+        'throughput_rps': total / wall_time if wall_time else 0.0,
+        'wall_time': wall_time,
+        'latency': {
+            'p50': percentile(ok_latencies, 50),
+            'p95': percentile(ok_latencies, 95),
+            'p99': percentile(ok_latencies, 99),
+            'max': max(ok_latencies) if ok_latencies else None,
+        },
+        'memory_mb': {
+            'before': rss_before,
+            'peak': max(sampler.rss),
+            'after': sampler.rss[-1],
+            'growth': sampler.rss[-1] - rss_before,
+        },
+        'threads': {
+            'before': threads_before,
+            'peak': max(sampler.threads),
+            'after': sampler.threads[-1],
+        },
+        'sample_errors': sorted(set(errors))[:5],
+    }
+
+
+def print_report(report):
+    def fmt(value):
+        return f"{value:.2f}s" if value is not None else "n/a"
+
+    latency = report['latency']
+    memory = report['memory_mb']
+    threads = report['threads']
+    print(f"\n📈 Load test: {report['users']} users against {report['target']}")
+    print("=" * 50)
+    print(f"Requests:    {report['requests']} in {report['wall_time']:.2f}s ({report['throughput_rps']:.2f} req/s)")
+    print(f"Errors:      {report['errors']} ({report['error_rate']:.1%})")
+    print(f"Latency:     p50 {fmt(latency['p50'])}  p95 {fmt(latency['p95'])}  "
+          f"p99 {fmt(latency['p99'])}  max {fmt(latency['max'])}")
+    print(f"Memory:      {memory['before']:.1f} MB -> {memory['after']:.1f} MB "
+          f"(peak {memory['peak']:.1f} MB, growth {memory['growth']:+.1f} MB)")
+    print(f"Threads:     {threads['before']} -> {threads['after']} (peak {threads['peak']})")
+    for error in report['sample_errors']:
+        print(f"  ❌ {error}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test run_crew or the Streamlit app against fake Gemini/Serper")
+    parser.add_argument('--target', choices=['crew', 'app'], default='crew', help="Entry point to drive")
+    parser.add_argument('--users', type=int, default=10, help="Concurrent virtual users")
+    parser.add_argument('--iterations', type=int, default=1, help="Requests per virtual user")
+    parser.add_argument('--ramp-up', type=float, default=0.0, help="Seconds over which users start")
+    parser.add_argument('--topic', action='append', help="Topic(s) users request (repeatable)")
+    parser.add_argument('--llm-latency', type=float, default=0.3, help="Mean fake Gemini latency (s)")
+    parser.add_argument('--llm-error-rate', type=float, default=0.0, help="Share of fake Gemini calls that fail")
+    parser.add_argument('--search-latency', type=float, default=0.1, help="Mean fake Serper latency (s)")
+    parser.add_argument('--search-error-rate', type=float, default=0.0, help="Share of fake Serper calls that fail")
+    parser.add_argument('--app-timeout', type=float, default=120, help="Per-run Streamlit script timeout (s)")
+    parser.add_argument('--json', help="Also write the report to this JSON file")
+    args = parser.parse_args()
+
+    # Point the crew at the stand-ins before any project module is imported
+    serper = FakeSerper(latency=args.search_latency, jitter=args.search_latency / 2,
+                        error_rate=args.search_error_rate)
+    os.environ.update({
+        'SERPER_SEARCH_URL': serper.url,
+        'SERPER_API_KEY': 'loadtest',
+        'GOOGLE_API_KEY': 'loadtest',
+        'OTEL_SDK_DISABLED': 'true',
+        'CREW_CONSOLE_LEVEL': 'ERROR',
+    })
+    install_fake_gemini(latency=args.llm_latency, jitter=args.llm_latency / 3,
+                        error_rate=args.llm_error_rate)
+
+    # Keep generated articles and logs out of the working tree
+    report_file = os.path.abspath(args.json) if args.json else None
+    sys.path.insert(0, APP_DIR)
+    workdir = tempfile.mkdtemp(prefix='crew-loadtest-')
+    os.chdir(workdir)
+
+    report = run_load_test(
+        target=args.target,
+        users=args.users,
+        iterations=args.iterations,
+        ramp_up=args.ramp_up,
+        topics=args.topic,
+        app_timeout=args.app_timeout
+    )
+    report['fake_serper_requests'] = serper.requests
+    report['workdir'] = workdir
+    serper.stop()
+
+    print_report(report)
+    if report_file:
+        with open(report_file, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+    sys.exit(1 if report['errors'] else 0)
+
+
+if __name__ == "__main__":
+    main()
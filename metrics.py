@@ -0,0 +1,16 @@
+"""
+Metrics helpers for AI Research & Writing Crew
+Small statistics shared by the hedging and load-testing code
+"""
+
+
+def percentile(samples, pct):
+    """Nearest-rank percentile of samples (None when there are none)"""
+    if not samples:
+        return None
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, int(round(pct / 100 * len(ordered))) - 1))
+    return ordered[index]
+
+
+__all__ = ['percentile']
@@ -0,0 +1,288 @@
+"""
+Declarative task pipelines for AI Research & Writing Crew
+Runs a DAG of tasks from a JSON config, executing independent branches concurrently
+"""
+
+import argparse
+import contextvars
+import json
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from dotenv import load_dotenv
+
+from event_log import get_event_log, run_context, verbose_enabled
+
+load_dotenv()
+
+log = get_event_log()
+
+# Agents a pipeline can use by name without defining them inline
+AGENT_FACTORIES = ('create_news_researcher', 'create_news_writer')
+
+# Tools inline agents can list; 'search' is the Serper tool from tools.py
+TOOL_NAMES = ('search',)
+
+CONTEXT_TEMPLATE = "\n\nResults of the previous steps you should build on:\n{pipeline_context}"
+
+
+def load_pipeline(path):
+    """Read and validate a pipeline config file"""
+    with open(path, 'r', encoding='utf-8') as f:
+        config = json.load(f)
+    validate_pipeline(config)
+    return config
+
+
+def validate_pipeline(config):
+    """Raise ValueError if the pipeline references unknown agents/tasks or has a cycle"""
+    agents = config.get('agents', {})
+    tasks = config.get('tasks', {})
+    if not tasks:
+        raise ValueError("Pipeline defines no tasks")
+
+    for name, spec in agents.items():
+        factory = spec.get('factory')
+        if factory and factory not in AGENT_FACTORIES:
+            raise ValueError(f"Agent '{name}' uses unknown factory '{factory}'")
+        if not factory and not all(spec.get(key) for key in ('role', 'goal', 'backstory')):
+            raise ValueError(f"Agent '{name}' needs a factory or role, goal and backstory")
+        for tool_name in spec.get('tools', []):
+            if tool_name not in TOOL_NAMES:
+                raise ValueError(f"Agent '{name}' uses unknown tool '{tool_name}'")
+
+    for name, spec in tasks.items():
+        if spec.get('agent') not in agents:
+            raise ValueError(f"Task '{name}' uses unknown agent '{spec.get('agent')}'")
+        for key in ('description', 'expected_output'):
+            if not spec.get(key):
+                raise ValueError(f"Task '{name}' is missing '{key}'")
+        for dependency in spec.get('depends_on', []):
+            if dependency not in tasks:
+                raise ValueError(f"Task '{name}' depends on unknown task '{dependency}'")
+
+    topological_order(tasks)
+
+
+def topological_order(tasks):
+    """Kahn's algorithm; raises ValueError on cycles"""
+    remaining = {name: set(spec.get('depends_on', [])) for name, spec in tasks.items()}
+    order = []
+    while remaining:
+        ready = sorted(name for name, deps in remaining.items() if not deps)
+        if not ready:
+            raise ValueError(f"Pipeline has a dependency cycle between: {', '.join(sorted(remaining))}")
+        for name in ready:
+            order.append(name)
+            del remaining[name]
+        for deps in remaining.values():
+            deps.difference_update(ready)
+    return order
+
+
+def critical_path(tasks, durations):
+    """
+    Longest chain of dependent tasks by measured duration.
+    Returns (path, seconds).
+    """
+    finish = {}
+    previous = {}
+    for name in topological_order(tasks):
+        deps = [dep for dep in tasks[name].get('depends_on', []) if dep in finish]
+        slowest = max(deps, key=lambda dep: finish[dep], default=None)
+        previous[name] = slowest
+        finish[name] = durations.get(name, 0.0) + (finish[slowest] if slowest else 0.0)
+
+    if not finish:
+        return [], 0.0
+    node = max(finish, key=finish.get)
+    total = finish[node]
+    path = []
+    while node:
+        path.append(node)
+        node = previous[node]
+    return list(reversed(path)), total
+
+
+def _build_agent(spec):
+    from crewai import Agent
+    import agents
+    from event_log import log_agent_step
+    from tools import tool
+
+    if spec.get('factory'):
+        return getattr(agents, spec['factory'])()
+
+    return Agent(
+        role=spec['role'],
+        goal=spec['goal'],
+        backstory=spec['backstory'],
+        verbose=verbose_enabled(),
+        memory=spec.get('memory', True),
+        tools=[tool] if 'search' in spec.get('tools', ['search']) else [],
+        llm=agents.llm,
+        step_callback=log_agent_step,
+        allow_delegation=spec.get('allow_delegation', False)
+    )
+
+
+def _run_node(name, config, inputs, upstream):
+    """Run one pipeline task as a single-task crew"""
+    from crewai import Crew, Process, Task
+    from tools import search_topic
+
+    spec = config['tasks'][name]
+    agent = _build_agent(config['agents'][spec['agent']])
+    description = spec['description']
+    node_inputs = dict(inputs)
+    if upstream:
+        description += CONTEXT_TEMPLATE
+        node_inputs['pipeline_context'] = "\n\n".join(
+            f"### {dependency}\n{output}" for dependency, output in upstream.items()
+        )
+
+    task = Task(
+        description=description,
+        expected_output=spec['expected_output'],
+        tools=list(agent.tools),
+        agent=agent,
+        output_file=spec.get('output_file')
+    )
+    crew = Crew(agents=[agent], tasks=[task], process=Process.sequential, verbose=verbose_enabled())
+
+    log.info('pipeline_task_started', f"▶️  {name} started", task=name)
+    start = time.monotonic()
+    with search_topic(inputs.get('topic')):
+        output = str(crew.kickoff(inputs=node_inputs))
+    return output, time.monotonic() - start
+
+
+def run_pipeline(config, inputs, max_workers=4):
+    """
+    Execute the pipeline DAG. Each task starts as soon as all the tasks it
+    depends on have finished, and receives their outputs as context.
+
+    Returns (outputs, report) where report holds per-task timings and the
+    critical path.
+    """
+    tasks = config['tasks']
+    outputs = {}
+    durations = {}
+    failed = set()
+    futures = {}
+    started = time.monotonic()
+
+    def ready(name):
+        deps = tasks[name].get('depends_on', [])
+        return (name not in outputs and name not in failed
+                and name not in futures.values()
+                and all(dep in outputs for dep in deps))
+
+    def submit(pool, name):
+        upstream = {dep: outputs[dep] for dep in tasks[name].get('depends_on', [])}
+        context = contextvars.copy_context()
+        futures[pool.submit(context.run, _run_node, name, config, inputs, upstream)] = name
+
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='pipeline') as pool:
+        for name in topological_order(tasks):
+            if ready(name):
+                submit(pool, name)
+
+        while futures:
+            done, _ = wait(list(futures), return_when=FIRST_COMPLETED)
+            for future in done:
+                name = futures.pop(future)
+                try:
+                    outputs[name], durations[name] = future.result()
+                    log.info(
+                        'pipeline_task_completed',
+                        f"✅ {name} finished in {durations[name]:.2f} seconds",
+                        task=name, duration=durations[name]
+                    )
+                except Exception as e:
+                    failed.add(name)
+                    log.error('pipeline_task_failed', f"❌ {name} failed: {e}", task=name, error=str(e))
+
+            # Tasks downstream of a failure can never run
+            changed = True
+            while changed:
+                changed = False
+                for name, spec in tasks.items():
+                    if name not in failed and name not in outputs and any(
+                        dep in failed for dep in spec.get('depends_on', [])
+                    ):
+                        failed.add(name)
+                        changed = True
+
+            for name in topological_order(tasks):
+                if ready(name):
+                    submit(pool, name)
+
+    path, path_seconds = critical_path(tasks, durations)
+    report = {
+        'wall_time': time.monotonic() - started,
+        'durations': durations,
+        'sequential_time': sum(durations.values()),
+        'critical_path': path,
+        'critical_path_time': path_seconds,
+        'failed': sorted(failed),
+    }
+    return outputs, report
+
+
+def final_output(config, outputs):
+    """Output of the pipeline's sink task(s), i.e. tasks nothing depends on"""
+    tasks = config['tasks']
+    upstream = {dep for spec in tasks.values() for dep in spec.get('depends_on', [])}
+    sinks = [name for name in topological_order(tasks) if name not in upstream]
+    return "\n\n".join(outputs[name] for name in sinks if name in outputs)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a task pipeline defined in a JSON file")
+    parser.add_argument('config', help="Pipeline file, e.g. pipelines/default.json")
+    parser.add_argument('topic', nargs='+', help="Research topic")
+    parser.add_argument('--workers', type=int, default=4, help="Maximum tasks running at once")
+    args = parser.parse_args()
+
+    from crew import check_requirements
+
+    try:
+        config = load_pipeline(args.config)
+    except (OSError, ValueError) as e:
+        print(f"❌ Invalid pipeline: {e}")
+        sys.exit(1)
+
+    topic = " ".join(args.topic)
+    with run_context():
+        log.info(
+            'pipeline_started',
+            f"🚀 Running pipeline '{config.get('name', args.config)}' on: {topic}",
+            pipeline=config.get('name'), topic=topic
+        )
+        if not check_requirements():
+            log.flush()
+            sys.exit(1)
+
+        outputs, report = run_pipeline(config, {'topic': topic}, max_workers=args.workers)
+        log.info(
+            'pipeline_completed',
+            f"⏱️  Wall time {report['wall_time']:.2f}s vs {report['sequential_time']:.2f}s sequential\n"
+            f"🛤️  Critical path ({report['critical_path_time']:.2f}s): {' -> '.join(report['critical_path'])}",
+            **report
+        )
+        log.flush()
+
+    if report['failed']:
+        print(f"\n❌ Failed tasks: {', '.join(report['failed'])}")
+        sys.exit(1)
+
+    print("\n📄 Pipeline output:")
+    print("=" * 50)
+    print(final_output(config, outputs))
+    print("=" * 50)
+
+
+if __name__ == "__main__":
+    main()
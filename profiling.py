@@ -0,0 +1,202 @@
+"""
+Run profiling for AI Research & Writing Crew
+Samples CPU stacks and allocations during a run and writes flamegraph-ready files
+"""
+
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+
+from event_log import env_flag
+
+# tracemalloc is process-wide, so overlapping RunProfilers share one session
+_tracemalloc_lock = threading.Lock()
+_tracemalloc_users = 0
+_tracemalloc_owned = False
+
+
+def _frame_label(frame):
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{frame.f_lineno})"
+
+
+def _acquire_tracemalloc():
+    global _tracemalloc_users, _tracemalloc_owned
+    with _tracemalloc_lock:
+        if _tracemalloc_users == 0 and not tracemalloc.is_tracing():
+            tracemalloc.start(int(os.getenv('CREW_PROFILE_TRACEBACK_DEPTH', '10')))
+            _tracemalloc_owned = True
+        _tracemalloc_users += 1
+
+
+def _release_tracemalloc():
+    """Stop tracing when the last profiler that needed it exits (if we started it)"""
+    global _tracemalloc_users, _tracemalloc_owned
+    with _tracemalloc_lock:
+        _tracemalloc_users -= 1
+        if _tracemalloc_users == 0 and _tracemalloc_owned:
+            tracemalloc.stop()
+            _tracemalloc_owned = False
+
+
+class SamplingProfiler:
+    """
+    Wall-clock sampling profiler: every interval seconds it records the
+    Python stack of the threads in thread_ids (every thread when None), so
+    time spent waiting on I/O shows up next to time spent computing.
+    """
+
+    def __init__(self, interval=0.01, thread_ids=None):
+        self.interval = interval
+        self.thread_ids = set(thread_ids) if thread_ids is not None else None
+        self.stacks = Counter()
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='profiler', daemon=True)
+
+    def _run(self):
+        own_ident = threading.get_ident()
+        while not self._stop.is_set():
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if self.thread_ids is not None and ident not in self.thread_ids:
+                    continue
+                if ident == own_ident or names.get(ident) in ('event-log-writer', 'loadtest-sampler'):
+                    continue
+                stack = []
+                while frame is not None:
+                    stack.append(_frame_label(frame))
+                    frame = frame.f_back
+                # Idle thread-pool workers blocked on their queue are not part of the run
+                if stack and stack[0].startswith('_worker (thread.py:'):
+                    continue
+                stack.append(names.get(ident, str(ident)))
+                self.stacks[';'.join(reversed(stack))] += 1
+            self.samples += 1
+            self._stop.wait(self.interval)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def collapsed(self):
+        """Stacks in the collapsed format read by flamegraph.pl and speedscope"""
+        return '\n'.join(f"{stack} {count}" for stack, count in self.stacks.most_common()) + '\n'
+
+    def hot_spots(self, limit=15):
+        """(label, self share, total share) for the frames seen most often"""
+        total = sum(self.stacks.values())
+        if not total:
+            return []
+        self_counts = Counter()
+        total_counts = Counter()
+        for stack, count in self.stacks.items():
+            frames = stack.split(';')[1:]
+            if not frames:
+                continue
+            self_counts[frames[-1]] += count
+            for label in set(frames):
+                total_counts[label] += count
+        return [
+            (label, count / total, total_counts[label] / total)
+            for label, count in self_counts.most_common(limit)
+        ]
+
+
+class RunProfiler:
+    """
+    Profile one crew run: CPU stack samples plus a tracemalloc snapshot.
+
+    Only the thread that enters the profiler is sampled, so other runs in
+    the same process (e.g. other Streamlit sessions) stay out of the
+    profile; set CREW_PROFILE_ALL_THREADS=1 to sample every thread.
+    Allocations are always traced process-wide.
+
+    Used as a context manager; on exit it writes
+    <name>.collapsed (flamegraph input), <name>.cpu.txt and <name>.alloc.txt
+    to output_dir and keeps a short text summary in .summary.
+    """
+
+    def __init__(self, output_dir, name, interval=None, top=15, all_threads=None):
+        self.output_dir = output_dir or '.'
+        self.name = name
+        self.top = top
+        self.interval = float(interval or os.getenv('CREW_PROFILE_INTERVAL', '0.01'))
+        self.all_threads = env_flag('CREW_PROFILE_ALL_THREADS') if all_threads is None else all_threads
+        self.profiler = None
+        self.files = {}
+        self.summary = ''
+
+    def __enter__(self):
+        _acquire_tracemalloc()
+        thread_ids = None if self.all_threads else {threading.get_ident()}
+        self.profiler = SamplingProfiler(self.interval, thread_ids)
+        # CPU time of this thread alone unless the whole process is sampled
+        self._cpu_clock = time.process_time if self.all_threads else time.thread_time
+        self._wall = time.perf_counter()
+        self._cpu = self._cpu_clock()
+        self.profiler.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.profiler.stop()
+        wall = time.perf_counter() - self._wall
+        cpu = self._cpu_clock() - self._cpu
+        try:
+            snapshot = tracemalloc.take_snapshot()
+            current, peak = tracemalloc.get_traced_memory()
+        finally:
+            _release_tracemalloc()
+
+        os.makedirs(self.output_dir, exist_ok=True)
+        base = os.path.join(self.output_dir, self.name)
+        self.files = {
+            'collapsed': f"{base}.collapsed",
+            'cpu': f"{base}.cpu.txt",
+            'alloc': f"{base}.alloc.txt",
+        }
+
+        hot_spots = self.profiler.hot_spots(self.top)
+        cpu_lines = [
+            f"Wall time: {wall:.2f}s  CPU time: {cpu:.2f}s  "
+            f"({cpu / wall:.0%} of one core busy)" if wall else "Wall time: 0s",
+            f"Samples: {self.profiler.samples} every {self.profiler.interval * 1000:.0f}ms "
+            f"of {'all threads in the process' if self.all_threads else 'the run thread'}",
+            "",
+            f"{'self':>7} {'total':>7}  frame",
+        ] + [f"{own:>7.1%} {total:>7.1%}  {label}" for label, own, total in hot_spots]
+
+        statistics = snapshot.filter_traces([
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, __file__),
+        ]).statistics('lineno')
+        alloc_lines = [
+            f"Traced memory (whole process): {current / 1024 / 1024:.1f} MB current, "
+            f"{peak / 1024 / 1024:.1f} MB peak",
+            "",
+        ] + [str(stat) for stat in statistics[:self.top * 2]]
+
+        with open(self.files['collapsed'], 'w', encoding='utf-8') as f:
+            f.write(self.profiler.collapsed())
+        with open(self.files['cpu'], 'w', encoding='utf-8') as f:
+            f.write('\n'.join(cpu_lines) + '\n')
+        with open(self.files['alloc'], 'w', encoding='utf-8') as f:
+            f.write('\n'.join(alloc_lines) + '\n')
+
+        self.summary = '\n'.join(
+            cpu_lines[:2]
+            + [f"Peak traced memory (whole process): {peak / 1024 / 1024:.1f} MB", "Top hot spots (self / total):"]
+            + [f"  {own:.1%} / {total:.1%}  {label}" for label, own, total in hot_spots[:5]]
+            + ["Top allocations:"]
+            + [f"  {stat}" for stat in statistics[:3]]
+        )
+        return False
+
+
+__all__ = ['SamplingProfiler', 'RunProfiler']
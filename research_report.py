@@ -0,0 +1,104 @@
+"""
+Structured research reports for AI Research & Writing Crew
+Validated JSON documents passed from the researcher to the writer and stored for reuse
+"""
+
+import json
+import os
+import re
+from typing import List
+
+from pydantic import BaseModel, Field, ValidationError
+
+REPORTS_DIR = os.getenv('CREW_RESEARCH_DIR', 'research')
+
+
+class Source(BaseModel):
+    id: int = Field(description="Number used to cite this source from claims")
+    title: str
+    url: str
+
+
+class Claim(BaseModel):
+    statement: str = Field(description="One factual statement, a single sentence")
+    sources: List[int] = Field(default_factory=list, description="ids of the sources backing the claim")
+
+
+class ResearchReport(BaseModel):
+    """What the researcher hands to the writer instead of free-form paragraphs"""
+
+    topic: str
+    trend: str = Field(description="The next big trend, one sentence")
+    claims: List[Claim] = Field(default_factory=list)
+    sources: List[Source] = Field(default_factory=list)
+    pros: List[str] = Field(default_factory=list)
+    cons: List[str] = Field(default_factory=list)
+    risks: List[str] = Field(default_factory=list)
+    opportunities: List[str] = Field(default_factory=list)
+
+
+REPORT_INSTRUCTIONS = (
+    "\n\nReturn ONLY a JSON object, without markdown fences, with these keys: "
+    "topic, trend (one sentence), claims (list of {{\"statement\", \"sources\": [source ids]}}), "
+    "sources (list of {{\"id\", \"title\", \"url\"}}), pros, cons, risks, opportunities "
+    "(lists of short strings). Keep every string short; do not write paragraphs."
+)
+
+
+def parse_report(text):
+    """Validate researcher output, tolerating text around the JSON object"""
+    if isinstance(text, ResearchReport):
+        return text
+    text = str(text)
+    try:
+        return ResearchReport.model_validate_json(text)
+    except ValidationError:
+        match = re.search(r"({.*})", text, re.DOTALL)
+        if not match:
+            raise ValueError("Research output does not contain a JSON report")
+        try:
+            return ResearchReport.model_validate_json(match.group(1))
+        except ValidationError as e:
+            raise ValueError(f"Research output is not a valid report: {e}")
+
+
+def to_prompt_json(report):
+    """Compact JSON for the writer's prompt (no whitespace, empty lists dropped)"""
+    data = {key: value for key, value in report.model_dump().items() if value not in ([], '')}
+    return json.dumps(data, separators=(',', ':'), ensure_ascii=False)
+
+
+def slugify(topic):
+    return re.sub(r'[^a-z0-9]+', '-', topic.lower()).strip('-') or 'topic'
+
+
+def report_path(topic, directory=None):
+    return os.path.join(directory or REPORTS_DIR, f"{slugify(topic)}.json")
+
+
+def save_report(report, directory=None):
+    """Store a report as stable, diffable JSON (sorted keys, one field per line)"""
+    path = report_path(report.topic, directory)
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(report.model_dump(), f, indent=2, sort_keys=True, ensure_ascii=False)
+        f.write('\n')
+    return path
+
+
+def load_report(topic, directory=None):
+    """Return the stored report for a topic, or None if there is none (or it is invalid)"""
+    path = report_path(topic, directory)
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return ResearchReport.model_validate_json(f.read())
+    except (OSError, ValidationError):
+        return None
+
+
+__all__ = [
+    'ResearchReport', 'Claim', 'Source', 'REPORT_INSTRUCTIONS', 'parse_report',
+    'to_prompt_json', 'slugify', 'report_path', 'save_report', 'load_report',
+]
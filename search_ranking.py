@@ -0,0 +1,176 @@
+"""
+Search result ranking for AI Research & Writing Crew
+Scores Serper results with BM25 and trims them to a prompt budget
+"""
+
+import math
+import re
+from collections import Counter
+
+STOPWORDS = frozenset("""
+a an and are as at be but by for from has have how in into is it its of on or
+that the their this to was were what when where which who why will with
+""".split())
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+_SENTENCE_RE = re.compile(r"(?<=[.!?])\s+")
+_FIELD_RE = re.compile(r"^(Title|Link|Snippet): ?(.*)$")
+
+
+def tokenize(text):
+    """Lowercase word tokens without stopwords"""
+    return [token for token in _TOKEN_RE.findall(text.lower()) if token not in STOPWORDS]
+
+
+class BM25:
+    """Okapi BM25 over a small in-memory corpus of token lists"""
+
+    def __init__(self, documents, k1=1.5, b=0.75):
+        self.k1 = k1
+        self.b = b
+        self.documents = [Counter(doc) for doc in documents]
+        self.lengths = [len(doc) for doc in documents]
+        self.avg_length = (sum(self.lengths) / len(self.lengths)) if self.lengths else 0.0
+
+        doc_freq = Counter()
+        for doc in self.documents:
+            doc_freq.update(doc.keys())
+        total = len(self.documents)
+        self.idf = {
+            term: math.log(1 + (total - freq + 0.5) / (freq + 0.5))
+            for term, freq in doc_freq.items()
+        }
+
+    def score(self, query_tokens, index):
+        doc = self.documents[index]
+        length_norm = 1 - self.b + self.b * (self.lengths[index] / self.avg_length if self.avg_length else 0)
+        score = 0.0
+        for term, weight in Counter(query_tokens).items():
+            freq = doc.get(term)
+            if not freq:
+                continue
+            score += weight * self.idf[term] * freq * (self.k1 + 1) / (freq + self.k1 * length_norm)
+        return score
+
+    def scores(self, query_tokens):
+        return [self.score(query_tokens, index) for index in range(len(self.documents))]
+
+
+def parse_serper_results(text):
+    """Split SerperDevTool's 'Title/Link/Snippet/---' text back into dicts"""
+    results = []
+    current = {}
+    body = text.strip()
+    if body.startswith('Search results:'):
+        body = body[len('Search results:'):]
+    for line in body.splitlines():
+        line = line.strip()
+        if line == '---':
+            if current:
+                results.append(current)
+            current = {}
+            continue
+        match = _FIELD_RE.match(line)
+        if match:
+            current[match.group(1).lower()] = match.group(2).strip()
+        elif current.get('snippet') is not None and line:
+            current['snippet'] += ' ' + line
+    if current:
+        results.append(current)
+    return results
+
+
+def format_serper_results(results):
+    """Render results in the same layout SerperDevTool produces"""
+    content = '\n'.join(
+        '\n'.join([
+            f"Title: {result.get('title', '')}",
+            f"Link: {result.get('link', '')}",
+            f"Snippet: {result.get('snippet', '')}",
+            "---",
+        ])
+        for result in results
+    )
+    return f"\nSearch results: {content}\n"
+
+
+def _shingles(tokens, size=3):
+    if len(tokens) < size:
+        return {tuple(tokens)}
+    return {tuple(tokens[i:i + size]) for i in range(len(tokens) - size + 1)}
+
+
+def _is_near_duplicate(shingles, kept, threshold):
+    for other in kept:
+        union = len(shingles | other)
+        if union and len(shingles & other) / union >= threshold:
+            return True
+    return False
+
+
+def trim_snippet(snippet, query_tokens, max_chars):
+    """Keep the sentences that best match the query, in their original order"""
+    if len(snippet) <= max_chars:
+        return snippet
+    sentences = [s for s in _SENTENCE_RE.split(snippet) if s]
+    if len(sentences) == 1:
+        return snippet[:max_chars].rstrip() + '…'
+
+    bm25 = BM25([tokenize(sentence) for sentence in sentences])
+    scores = bm25.scores(query_tokens)
+    ranked = sorted(range(len(sentences)), key=lambda i: scores[i], reverse=True)
+    chosen = []
+    used = 0
+    for index in ranked:
+        length = len(sentences[index]) + 1
+        if chosen and (used + length > max_chars or scores[index] <= 0):
+            continue
+        chosen.append(index)
+        used += length
+    return ' '.join(sentences[i] for i in sorted(chosen))[:max_chars]
+
+
+def rank_results(results, query, topic=None, top_n=5, char_budget=3000,
+                 snippet_chars=400, dedup_threshold=0.8):
+    """
+    Order results by BM25 relevance to the query and topic, drop
+    near-identical snippets and keep the top_n within char_budget.
+    """
+    if not results:
+        return []
+
+    query_tokens = tokenize(query or '') + tokenize(topic or '')
+    documents = [tokenize(f"{r.get('title', '')} {r.get('snippet', '')}") for r in results]
+    bm25 = BM25(documents)
+    scores = bm25.scores(query_tokens)
+    order = sorted(range(len(results)), key=lambda i: scores[i], reverse=True)
+    if scores[order[0]] > 0:
+        # Results sharing no terms with the query or topic only cost tokens
+        order = [index for index in order if scores[index] > 0]
+
+    ranked = []
+    kept_shingles = []
+    used = 0
+    for index in order:
+        if len(ranked) >= top_n:
+            break
+        result = dict(results[index])
+        shingles = _shingles(tokenize(result.get('snippet', '')) or documents[index])
+        if _is_near_duplicate(shingles, kept_shingles, dedup_threshold):
+            continue
+
+        result['snippet'] = trim_snippet(result.get('snippet', ''), query_tokens, snippet_chars)
+        size = sum(len(result.get(field, '')) for field in ('title', 'link', 'snippet'))
+        if used + size > char_budget and ranked:
+            continue
+
+        ranked.append(result)
+        kept_shingles.append(shingles)
+        used += size
+    return ranked
+
+
+__all__ = [
+    'BM25', 'tokenize', 'parse_serper_results', 'format_serper_results',
+    'trim_snippet', 'rank_results',
+]
@@ -0,0 +1,157 @@
+"""
+Single-flight request coalescing for AI Research & Writing Crew
+Lets concurrent identical web searches and LLM calls share one in-flight call
+"""
+
+import functools
+import hashlib
+import json
+import threading
+
+from event_log import env_flag
+
+
+class _InFlightCall:
+    """A call currently being executed by a leader thread"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """
+    Coalesce concurrent calls that share the same key.
+
+    The first caller for a key (the leader) executes the function; every
+    caller that arrives with the same key while it is still running waits
+    for it and receives the same result (or the same exception).
+    Nothing is cached once the call has finished.
+    """
+
+    def __init__(self, name):
+        self.name = name
+        self._lock = threading.Lock()
+        self._calls = {}
+        self._stats = {
+            'calls': 0,
+            'executed': 0,
+            'coalesced': 0,
+            'errors': 0,
+        }
+
+    def do(self, key, fn, *args, **kwargs):
+        """Run fn(*args, **kwargs) unless an identical call is already in flight"""
+        with self._lock:
+            self._stats['calls'] += 1
+            call = self._calls.get(key)
+            if call is not None:
+                call.waiters += 1
+                self._stats['coalesced'] += 1
+                is_leader = False
+            else:
+                call = _InFlightCall()
+                self._calls[key] = call
+                self._stats['executed'] += 1
+                is_leader = True
+
+        if not is_leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn(*args, **kwargs)
+        except BaseException as e:
+            call.error = e
+            with self._lock:
+                self._stats['errors'] += 1
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.done.set()
+
+        return call.result
+
+    def get_stats(self):
+        """Return a snapshot of the coalescing metrics"""
+        with self._lock:
+            stats = dict(self._stats)
+            stats['in_flight'] = len(self._calls)
+        stats['name'] = self.name
+        stats['coalesced_ratio'] = (
+            stats['coalesced'] / stats['calls'] if stats['calls'] else 0.0
+        )
+        return stats
+
+
+# Shared groups so every agent in the process coalesces against the same calls
+search_flight = SingleFlight('search')
+llm_flight = SingleFlight('llm')
+
+
+def is_enabled():
+    """Single-flight can be switched off with CREW_SINGLE_FLIGHT=0"""
+    return env_flag('CREW_SINGLE_FLIGHT', default=True)
+
+
+def make_key(*parts):
+    """Build a stable hash key from JSON-serialisable call arguments"""
+    payload = json.dumps(parts, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def search_key(*args, **kwargs):
+    """Key for SerperDevTool._run calls (search_query / query kwargs)"""
+    return make_key('search', list(args), kwargs)
+
+
+def llm_key(messages, stop=None, run_manager=None, **kwargs):
+    """Key for chat model _generate calls; the per-call run_manager is ignored"""
+    prompt = [(message.type, message.content) for message in messages]
+    return make_key('llm', prompt, stop, kwargs)
+
+
+def coalesce(obj, method_name, group, key_fn):
+    """
+    Route obj.method_name through a SingleFlight group.
+
+    The wrapper is installed on the instance with object.__setattr__ so it
+    works for both pydantic v1 (langchain) and v2 (crewai-tools) models.
+    """
+    if obj is None or not is_enabled():
+        return obj
+
+    original = getattr(obj, method_name)
+
+    @functools.wraps(original)
+    def coalesced(*args, **kwargs):
+        return group.do(key_fn(*args, **kwargs), original, *args, **kwargs)
+
+    object.__setattr__(obj, method_name, coalesced)
+    return obj
+
+
+def get_coalescing_stats(since=None):
+    """
+    Metrics for all shared single-flight groups. The counters are process
+    totals; pass an earlier result as since to get only what happened
+    after it (still including any runs that overlapped)
+    """
+    stats = {group.name: group.get_stats() for group in (search_flight, llm_flight)}
+    for name, before in (since or {}).items():
+        for counter in ('calls', 'executed', 'coalesced', 'errors'):
+            stats[name][counter] -= before[counter]
+        calls = stats[name]['calls']
+        stats[name]['coalesced_ratio'] = stats[name]['coalesced'] / calls if calls else 0.0
+    return stats
+
+
+__all__ = [
+    'SingleFlight', 'search_flight', 'llm_flight', 'coalesce',
+    'make_key', 'search_key', 'llm_key', 'get_coalescing_stats',
+]
@@ -1,29 +1,62 @@
 from crewai import Task
 from tools import tool
 from agents import news_researcher,news_writer
+from research_report import REPORT_INSTRUCTIONS, ResearchReport
 
 
-research_task = Task(
-  description=(
+def create_research_task(agent=None, structured=False):
+  """
+  Build the research task; use a fresh one per concurrent run. With
+  structured=True the report is a validated JSON ResearchReport instead
+  of free-form paragraphs.
+  """
+  description = (
     "Identify the next big trend in {topic}."
     "Focus on identifying pros and cons and the overall narrative."
     "Your final report should clearly articulate the key points,"
     "its market opportunities, and potential risks."
-  ),
-  expected_output='A comprehensive 3 paragraphs long report on the latest AI trends.',
-  tools=[tool],
-  agent=news_researcher,
-)
-
-write_task = Task(
-  description=(
+  )
+  if structured:
+    return Task(
+      description=description + REPORT_INSTRUCTIONS,
+      expected_output='A compact JSON research report on {topic} with claims, sources, pros, cons, risks and opportunities.',
+      tools=[tool],
+      agent=agent or news_researcher,
+      output_pydantic=ResearchReport,
+    )
+
+  return Task(
+    description=description,
+    expected_output='A comprehensive 3 paragraphs long report on the latest AI trends.',
+    tools=[tool],
+    agent=agent or news_researcher,
+  )
+
+def create_write_task(agent=None, output_file='new-blog-post.md', with_report=False):
+  """
+  Build the writing task. With with_report=True the research is passed in
+  through the {research_report} input instead of a preceding research task.
+  """
+  description = (
     "Compose an insightful article on {topic}."
     "Focus on the latest trends and how it's impacting the industry."
     "This article should be easy to understand, engaging, and positive."
-  ),
-  expected_output='A 4 paragraph article on {topic} advancements formatted as markdown.',
-  tools=[tool],
-  agent=news_writer,
-  async_execution=False,
-  output_file='new-blog-post.md'
-)
\ No newline at end of file
+  )
+  if with_report:
+    description += (
+      "\n\nBase the article on this research report:\n{research_report}"
+    )
+
+  return Task(
+    description=description,
+    expected_output='A 4 paragraph article on {topic} advancements formatted as markdown.',
+    tools=[tool],
+    agent=agent or news_writer,
+    async_execution=False,
+    output_file=output_file
+  )
+
+
+research_task = create_research_task()
+
+write_task = create_write_task()
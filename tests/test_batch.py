@@ -0,0 +1,75 @@
+from batch import cluster_topics, plan_batch, umbrella_topic
+
+
+def as_sets(clusters):
+    return sorted(sorted(cluster) for cluster in clusters)
+
+
+def test_related_topics_share_one_research_run():
+    plan = plan_batch(["AI in radiology", "AI in pathology", "AI in diagnostics"])
+    assert plan == [
+        ("AI in radiology, pathology and diagnostics",
+         ["AI in radiology", "AI in pathology", "AI in diagnostics"]),
+    ]
+
+
+def test_shared_prefix_alone_does_not_merge_topics():
+    topics = ["AI in finance", "AI in music", "AI in agriculture", "AI in radiology", "AI in sports"]
+    assert as_sets(cluster_topics(topics)) == as_sets([[topic] for topic in topics])
+
+
+def test_shared_leading_word_in_different_fields_does_not_merge():
+    assert len(cluster_topics(["cloud security", "cloud gaming"])) == 2
+
+
+def test_general_topic_is_not_merged_into_specific_one():
+    assert len(cluster_topics(["AI", "AI in healthcare"])) == 2
+
+
+def test_mixed_batch_groups_by_field():
+    topics = ["AI in radiology", "AI in pathology", "AI in banking", "AI in insurance", "AI in music"]
+    assert as_sets(cluster_topics(topics)) == as_sets([
+        ["AI in radiology", "AI in pathology"],
+        ["AI in banking", "AI in insurance"],
+        ["AI in music"],
+    ])
+
+
+def test_same_subject_topics_merge_without_a_known_field():
+    assert cluster_topics(["quantum computing", "quantum computing hardware"]) == [
+        ["quantum computing", "quantum computing hardware"],
+    ]
+    topics = [
+        "large language models in education",
+        "large language models for coding",
+        "large language models safety",
+    ]
+    assert cluster_topics(topics) == [topics]
+
+
+def test_same_field_without_shared_words_does_not_merge():
+    assert len(cluster_topics(["AI in banking", "crypto taxes"])) == 2
+    assert len(cluster_topics(["hospital billing software", "cancer genomics"])) == 2
+
+
+def test_shared_words_in_one_field_merge():
+    topics = ["drug discovery startups", "drug discovery funding", "quantum computing"]
+    assert as_sets(cluster_topics(topics)) == as_sets([
+        ["drug discovery startups", "drug discovery funding"],
+        ["quantum computing"],
+    ])
+
+
+def test_cluster_size_is_capped():
+    topics = [f"AI in {field}" for field in ("radiology", "pathology", "oncology", "cardiology", "surgery")]
+    assert [len(cluster) for cluster in cluster_topics(topics, max_cluster_size=2)] == [2, 2, 1]
+
+
+def test_duplicates_and_blanks_are_ignored():
+    assert cluster_topics(["AI in music", " AI in music ", ""]) == [["AI in music"]]
+
+
+def test_umbrella_topic():
+    assert umbrella_topic(["AI in radiology"]) == "AI in radiology"
+    assert umbrella_topic(["AI in radiology", "AI in pathology"]) == "AI in radiology and pathology"
+    assert umbrella_topic(["AI", "AI in healthcare"]) == "AI"
@@ -0,0 +1,220 @@
+import json
+import sys
+import threading
+import time
+import types
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from circuit_breaker import (
+    CLOSED, HALF_OPEN, OPEN, CallTimeoutError, CircuitBreaker, CircuitOpenError, StaleCache,
+)
+
+
+def fail():
+    raise ConnectionError('down')
+
+
+def test_breaker_opens_after_consecutive_failures_and_fails_fast():
+    breaker = CircuitBreaker('test', failure_threshold=2, recovery_timeout=60)
+    for _ in range(2):
+        with pytest.raises(ConnectionError):
+            breaker.call(fail)
+    assert breaker.state == OPEN
+
+    with pytest.raises(CircuitOpenError):
+        breaker.call(lambda: 'never called')
+    stats = breaker.get_stats()
+    assert stats['failures'] == 2
+    assert stats['rejected'] == 1
+    assert stats['opened'] == 1
+
+
+def test_success_resets_consecutive_failures():
+    breaker = CircuitBreaker('test', failure_threshold=2)
+    with pytest.raises(ConnectionError):
+        breaker.call(fail)
+    assert breaker.call(lambda: 'ok') == 'ok'
+    with pytest.raises(ConnectionError):
+        breaker.call(fail)
+    assert breaker.state == CLOSED
+
+
+def test_half_open_trial_closes_or_reopens():
+    breaker = CircuitBreaker('test', failure_threshold=1, recovery_timeout=0.05)
+    with pytest.raises(ConnectionError):
+        breaker.call(fail)
+    time.sleep(0.06)
+    assert breaker.state == HALF_OPEN
+    with pytest.raises(ConnectionError):
+        breaker.call(fail)
+    assert breaker.state == OPEN
+
+    time.sleep(0.06)
+    assert breaker.call(lambda: 'ok') == 'ok'
+    assert breaker.state == CLOSED
+
+
+def test_timeouts_and_flagged_results_count_as_failures():
+    breaker = CircuitBreaker('test', failure_threshold=2)
+
+    def timeout():
+        raise CallTimeoutError('slow')
+
+    with pytest.raises(CallTimeoutError):
+        breaker.call(timeout)
+    assert breaker.call(lambda: {'statusCode': 500}, is_failure=lambda r: 'statusCode' in r) == {'statusCode': 500}
+    stats = breaker.get_stats()
+    assert stats['timeouts'] == 1
+    assert stats['state'] == OPEN
+
+
+def test_stale_cache_evicts_least_recently_used():
+    cache = StaleCache(max_entries=2)
+    cache.put('a', 1)
+    cache.put('b', 2)
+    cache.get('a')
+    cache.put('c', 3)
+    assert cache.get('b') is None
+    assert cache.get('a')[0] == 1
+
+
+# ----------------------------------------------------------------------
+# Search tool wrappers against a local fake Serper
+# ----------------------------------------------------------------------
+
+class FakeSerper:
+    """Serper stand-in whose behaviour ('ok', 'hang' or 'error') can be switched"""
+
+    def __init__(self, hang_seconds=1.0):
+        self.mode = 'ok'
+        self.requests = 0
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_POST(self):
+                query = json.loads(self.rfile.read(int(self.headers['Content-Length'])))['q']
+                fake.requests += 1
+                if fake.mode == 'hang':
+                    time.sleep(hang_seconds)
+                if fake.mode == 'error':
+                    body = {'message': 'Unauthorized', 'statusCode': 403}
+                else:
+                    body = {'organic': [
+                        {'title': f"{query} news", 'link': 'https://example.com', 'snippet': f"About {query}."},
+                    ]}
+                data = json.dumps(body).encode('utf-8')
+                try:
+                    self.send_response(200)
+                    self.send_header('Content-Type', 'application/json')
+                    self.send_header('Content-Length', str(len(data)))
+                    self.end_headers()
+                    self.wfile.write(data)
+                except OSError:
+                    pass
+
+        self._server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self._server.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self._server.server_port}/search"
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+
+class StubSerperDevTool:
+    """Stands in for crewai_tools.SerperDevTool; the wrappers under test replace _run"""
+
+    def __init__(self, search_url='https://google.serper.dev/search'):
+        self.search_url = search_url
+        self.n_results = 10
+
+
+@pytest.fixture
+def tools(monkeypatch):
+    # tools.py builds its SerperDevTool at import time and exits without
+    # crewai_tools; the wrappers tested here never touch the real tool
+    try:
+        import crewai_tools  # noqa: F401
+    except ImportError:
+        monkeypatch.setitem(
+            sys.modules, 'crewai_tools', types.SimpleNamespace(SerperDevTool=StubSerperDevTool)
+        )
+    import tools
+    return tools
+
+
+@pytest.fixture
+def serper():
+    fake = FakeSerper()
+    yield fake
+    fake.stop()
+
+
+def make_search(tools, serper, breaker):
+    tool = types.SimpleNamespace(search_url=serper.url, n_results=10)
+    tools.add_search_timeout(tool, timeout=0.2)
+    tools.add_circuit_breaker(tool, breaker=breaker, cache=StaleCache())
+    return tool._run
+
+
+def test_breaker_cycle_against_fake_serper(tools, serper):
+    breaker = CircuitBreaker('test', failure_threshold=2, recovery_timeout=0.5)
+    search = make_search(tools, serper, breaker)
+
+    fresh = search(search_query='AI')
+    assert fresh.startswith('\nSearch results: Title: AI news')
+
+    # Timeouts count as failures and the last good results are served as stale
+    serper.mode = 'hang'
+    for _ in range(2):
+        stale = search(search_query='AI')
+        assert stale.startswith('[STALE RESULTS')
+        assert stale.endswith(fresh)
+    assert breaker.state == OPEN
+    assert breaker.get_stats()['timeouts'] == 2
+
+    # While open, searches fail fast without reaching Serper
+    requests_before = serper.requests
+    started = time.monotonic()
+    assert search(search_query='AI').startswith('[STALE RESULTS')
+    assert time.monotonic() - started < 0.1
+    assert serper.requests == requests_before
+
+    # After the recovery timeout one trial call goes through and closes it
+    serper.mode = 'ok'
+    time.sleep(0.5)
+    assert breaker.state == HALF_OPEN
+    assert search(search_query='AI') == fresh
+    assert breaker.state == CLOSED
+
+
+def test_api_errors_without_cache_return_notice(tools, serper):
+    breaker = CircuitBreaker('test', failure_threshold=5)
+    search = make_search(tools, serper, breaker)
+
+    serper.mode = 'error'
+    notice = search(search_query='never searched before')
+    assert notice.startswith('Web search is temporarily unavailable and there are no cached results')
+    assert breaker.get_stats()['failures'] == 1
+
+
+def test_hung_calls_do_not_block_later_searches(tools, serper):
+    breaker = CircuitBreaker('test', failure_threshold=100)
+    search = make_search(tools, serper, breaker)
+
+    serper.mode = 'hang'
+    with ThreadPoolExecutor(max_workers=12) as pool:
+        list(pool.map(lambda i: search(search_query=f'hung {i}'), range(12)))
+    assert breaker.get_stats()['timeouts'] == 12
+
+    serper.mode = 'ok'
+    started = time.monotonic()
+    assert search(search_query='AI').startswith('\nSearch results:')
+    assert time.monotonic() - started < 0.2
@@ -0,0 +1,157 @@
+import io
+import json
+import threading
+
+import pytest
+
+from event_log import EventLog, current_run_id, env_flag, run_context
+
+
+@pytest.mark.parametrize('value', ['1', 'true', 'TRUE', 'yes', 'on', ' On '])
+def test_env_flag_truthy(monkeypatch, value):
+    monkeypatch.setenv('CREW_TEST_FLAG', value)
+    assert env_flag('CREW_TEST_FLAG') is True
+    assert env_flag('CREW_TEST_FLAG', default=True) is True
+
+
+@pytest.mark.parametrize('value', ['0', 'false', 'False', 'no', 'off'])
+def test_env_flag_falsy(monkeypatch, value):
+    monkeypatch.setenv('CREW_TEST_FLAG', value)
+    assert env_flag('CREW_TEST_FLAG') is False
+    assert env_flag('CREW_TEST_FLAG', default=True) is False
+
+
+@pytest.mark.parametrize('value', [None, '', 'maybe'])
+def test_env_flag_falls_back_to_default(monkeypatch, value):
+    if value is None:
+        monkeypatch.delenv('CREW_TEST_FLAG', raising=False)
+    else:
+        monkeypatch.setenv('CREW_TEST_FLAG', value)
+    assert env_flag('CREW_TEST_FLAG') is False
+    assert env_flag('CREW_TEST_FLAG', default=True) is True
+
+
+def test_switches_read_false_the_same_way(monkeypatch):
+    import hedging
+    import singleflight
+
+    monkeypatch.setenv('CREW_LLM_HEDGING', 'false')
+    monkeypatch.setenv('CREW_SINGLE_FLIGHT', 'false')
+    assert hedging.is_enabled() is False
+    assert singleflight.is_enabled() is False
+
+
+# ----------------------------------------------------------------------
+# EventLog
+# ----------------------------------------------------------------------
+
+
+def read_events(path):
+    with open(path, encoding='utf-8') as f:
+        return [json.loads(line) for line in f]
+
+
+@pytest.fixture
+def make_log(tmp_path):
+    logs = []
+
+    def make(**kwargs):
+        kwargs.setdefault('path', str(tmp_path / 'events.jsonl'))
+        kwargs.setdefault('console_level', 'ERROR')
+        event_log = EventLog(**kwargs)
+        logs.append(event_log)
+        return event_log
+
+    yield make
+    for event_log in logs:
+        event_log.close()
+
+
+def test_events_are_written_as_json_lines(make_log):
+    log = make_log()
+    log.info('run_started', "Starting", topic='AI')
+    log.close()
+
+    [event] = read_events(log.path)
+    assert event['event'] == 'run_started'
+    assert event['level'] == 'INFO'
+    assert event['message'] == 'Starting'
+    assert event['topic'] == 'AI'
+    assert event['run_id'] is None
+
+
+def test_file_and_console_levels_filter_independently(make_log, capsys):
+    log = make_log(level='WARNING', console_level='INFO')
+    log.debug('debug_event', "not shown anywhere")
+    log.info('info_event', "console only")
+    log.warning('warning_event', "console and file")
+    log.info('silent_event')
+    log.close()
+
+    assert [event['event'] for event in read_events(log.path)] == ['warning_event']
+    assert capsys.readouterr().out.splitlines() == ["console only", "console and file"]
+
+
+def test_large_payloads_are_truncated_unless_sampled(make_log, tmp_path):
+    truncating = make_log(max_payload_chars=10, sample_rate=0.0)
+    truncating.info('step', output='x' * 25, count=12345678901)
+    truncating.close()
+    [event] = read_events(truncating.path)
+    assert event['output'] == 'x' * 10 + '...[truncated 15 chars]'
+    assert event['count'] == 12345678901
+
+    sampling = make_log(path=str(tmp_path / 'sampled.jsonl'), max_payload_chars=10, sample_rate=1.0)
+    sampling.info('step', output='x' * 25)
+    sampling.close()
+    assert read_events(sampling.path)[0]['output'] == 'x' * 25
+
+
+def test_run_context_tags_events(make_log):
+    log = make_log()
+    with run_context('run-1') as run_id:
+        assert current_run_id() == 'run-1'
+        log.info('inside')
+    log.info('outside')
+    log.close()
+
+    assert run_id == 'run-1'
+    assert [event['run_id'] for event in read_events(log.path)] == ['run-1', None]
+
+
+def test_full_buffer_drops_events_and_reports_them(make_log, monkeypatch, capsys):
+    writing = threading.Event()
+    release = threading.Event()
+
+    class BlockingStdout(io.StringIO):
+        def write(self, text):
+            writing.set()
+            release.wait(5)
+            return super().write(text)
+
+    monkeypatch.setattr('sys.stdout', BlockingStdout())
+    log = make_log(buffer_size=2, console_level='INFO')
+    log.info('first', "blocks the writer")
+    assert writing.wait(5)
+
+    for index in range(5):
+        log.info('queued', index=index)
+    assert log.dropped == 3
+
+    release.set()
+    log.flush()
+    assert [event['event'] for event in read_events(log.path)] == ['first', 'queued', 'queued']
+
+    log.close()
+    assert 'dropped 3 events' in capsys.readouterr().err
+
+
+def test_flush_waits_for_pending_events_and_close_is_idempotent(make_log):
+    log = make_log()
+    for index in range(200):
+        log.info('step', index=index)
+    log.flush()
+    assert len(read_events(log.path)) == 200
+
+    log.close()
+    log.close()
+    assert not log._thread.is_alive()
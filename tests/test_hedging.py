@@ -0,0 +1,107 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from hedging import HedgedCaller, LatencyWindow
+
+
+def warm_up(caller, seconds=0.001):
+    for _ in range(caller.min_samples):
+        caller.call(time.sleep, seconds)
+
+
+def test_latency_window_percentile():
+    window = LatencyWindow(size=100)
+    assert window.percentile(95) is None
+    for value in range(1, 101):
+        window.add(value)
+    assert window.percentile(50) == 50
+    assert window.percentile(95) == 95
+    assert window.percentile(100) == 100
+
+
+def test_no_hedging_while_warming_up():
+    caller = HedgedCaller('test', min_samples=3)
+    assert caller.hedge_delay() is None
+    warm_up(caller)
+    assert caller.hedge_delay() == caller.min_delay
+    assert caller.get_stats()['hedged'] == 0
+
+
+def test_concurrent_calls_are_not_capped_by_a_pool():
+    caller = HedgedCaller('test', min_samples=3, min_delay=5.0)
+    warm_up(caller)
+
+    started = time.monotonic()
+    with ThreadPoolExecutor(max_workers=32) as pool:
+        results = list(pool.map(lambda i: caller.call(lambda: time.sleep(0.2) or i), range(32)))
+    elapsed = time.monotonic() - started
+
+    assert results == list(range(32))
+    assert elapsed < 0.35
+    assert caller.get_stats()['hedged'] == 0
+    # Recorded latency is the call itself, not time spent waiting to start
+    assert caller.latencies.percentile(100) < 0.3
+
+
+def test_hedge_wins_when_the_primary_is_slow():
+    caller = HedgedCaller('test', min_samples=3, min_delay=0.05, max_hedge_rate=1.0)
+    warm_up(caller)
+    attempts = []
+    lock = threading.Lock()
+
+    def first_call_hangs():
+        with lock:
+            attempts.append(1)
+            attempt = len(attempts)
+        time.sleep(1.0 if attempt == 1 else 0.01)
+        return attempt
+
+    started = time.monotonic()
+    assert caller.call(first_call_hangs) == 2
+    assert time.monotonic() - started < 0.5
+    stats = caller.get_stats()
+    assert stats['hedged'] == 1
+    assert stats['hedges_won'] == 1
+
+
+def test_hedge_rate_is_capped():
+    caller = HedgedCaller('test', min_samples=5, min_delay=0.01, max_hedge_rate=0.1)
+    warm_up(caller)
+
+    # Every call is slower than the hedge delay, so each one would hedge
+    with ThreadPoolExecutor(max_workers=40) as pool:
+        list(pool.map(lambda i: caller.call(time.sleep, 0.1), range(40)))
+
+    stats = caller.get_stats()
+    assert stats['calls'] == 45
+    assert 1 <= stats['hedged'] <= 0.1 * stats['calls']
+    assert stats['rate_limited'] == 40 - stats['hedged']
+
+
+def test_error_is_raised_when_primary_and_hedge_fail():
+    caller = HedgedCaller('test', min_samples=3, min_delay=0.01, max_hedge_rate=1.0)
+    warm_up(caller)
+
+    def slow_failure():
+        time.sleep(0.05)
+        raise RuntimeError('Gemini unavailable')
+
+    with pytest.raises(RuntimeError, match='Gemini unavailable'):
+        caller.call(slow_failure)
+    assert caller.get_stats()['errors'] == 1
+
+
+def test_hedging_stats_since_an_earlier_snapshot(monkeypatch):
+    from hedging import get_hedging_stats, llm_hedger
+
+    monkeypatch.setenv('CREW_LLM_HEDGING', '0')
+    assert get_hedging_stats() is None
+
+    monkeypatch.setenv('CREW_LLM_HEDGING', '1')
+    llm_hedger.call(time.sleep, 0)
+    before = get_hedging_stats()
+    llm_hedger.call(time.sleep, 0)
+    assert get_hedging_stats(since=before)['calls'] == 1
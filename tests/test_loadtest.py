@@ -0,0 +1,85 @@
+import json
+import threading
+import time
+import urllib.request
+
+import pytest
+
+import loadtest
+from loadtest import FakeSerper, rss_mb, run_load_test
+from metrics import percentile
+
+
+def test_percentile_is_nearest_rank():
+    assert percentile([], 50) is None
+    assert percentile([3.0, 1.0, 2.0], 50) == 2.0
+    assert percentile([3.0, 1.0, 2.0], 99) == 3.0
+    assert percentile([5.0], 1) == 5.0
+
+
+def test_rss_is_reported():
+    assert rss_mb() > 0
+
+
+def test_fake_serper_answers_like_serper():
+    serper = FakeSerper(latency=0.0, jitter=0.0)
+    try:
+        request = urllib.request.Request(
+            serper.url, data=json.dumps({'q': 'AI'}).encode('utf-8'),
+            headers={'content-type': 'application/json'}
+        )
+        body = json.loads(urllib.request.urlopen(request, timeout=5).read())
+    finally:
+        serper.stop()
+    assert len(body['organic']) == 8
+    assert body['organic'][0]['title'] == 'Fake result 0 about AI'
+    assert serper.requests == 1
+
+
+@pytest.fixture
+def stub_requests(monkeypatch):
+    seen = []
+    lock = threading.Lock()
+
+    def install(seconds=0.05, failing_topics=()):
+        def crew_request(topic):
+            with lock:
+                seen.append(topic)
+            time.sleep(seconds)
+            if topic in failing_topics:
+                raise RuntimeError(f"run_crew returned no result for {topic}")
+
+        monkeypatch.setattr(loadtest, '_crew_request', crew_request)
+        return seen
+
+    return install
+
+
+def test_run_load_test_reports_latency_and_resources(stub_requests):
+    seen = stub_requests(seconds=0.05)
+    report = run_load_test(users=4, iterations=3, topics=['AI in healthcare', 'AI in finance'])
+
+    assert report['requests'] == 12
+    assert len(seen) == 12
+    assert set(seen) == {'AI in healthcare', 'AI in finance'}
+    assert report['errors'] == 0
+    assert report['error_rate'] == 0.0
+    assert set(report['latency']) == {'p50', 'p95', 'p99', 'max'}
+    assert 0.05 <= report['latency']['p50'] <= report['latency']['p99'] <= report['latency']['max']
+    # Users run concurrently: three rounds of 0.05s, not twelve
+    assert report['wall_time'] < 0.4
+    assert report['throughput_rps'] > 0
+    assert set(report['memory_mb']) == {'before', 'peak', 'after', 'growth'}
+    assert report['threads']['peak'] >= report['threads']['before']
+
+
+def test_run_load_test_counts_failures(stub_requests):
+    stub_requests(seconds=0.01, failing_topics={'AI in finance'})
+    report = run_load_test(users=2, iterations=2, topics=['AI in healthcare', 'AI in finance'])
+
+    assert report['requests'] == 4
+    assert report['errors'] == 2
+    assert report['error_rate'] == 0.5
+    assert report['sample_errors'] == ['RuntimeError: run_crew returned no result for AI in finance']
+    # Latency percentiles only cover successful requests
+    assert report['latency']['p50'] is not None
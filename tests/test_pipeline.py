@@ -0,0 +1,122 @@
+import os
+import threading
+import time
+
+import pytest
+
+import pipeline
+from event_log import current_run_id, run_context
+from pipeline import (
+    critical_path, final_output, load_pipeline, run_pipeline, topological_order, validate_pipeline,
+)
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def task(*depends_on):
+    return {'agent': 'writer', 'description': 'd', 'expected_output': 'o', 'depends_on': list(depends_on)}
+
+
+TASKS = {
+    'research': task(),
+    'keywords': task(),
+    'fact_check': task('research'),
+    'write': task('fact_check', 'keywords'),
+}
+
+
+def test_topological_order_puts_dependencies_first():
+    order = topological_order(TASKS)
+    assert order.index('research') < order.index('fact_check') < order.index('write')
+    assert order.index('keywords') < order.index('write')
+
+
+def test_topological_order_rejects_cycles():
+    with pytest.raises(ValueError, match='cycle'):
+        topological_order({'a': task('b'), 'b': task('a'), 'c': task()})
+
+
+def test_critical_path_follows_the_slowest_chain():
+    durations = {'research': 10.0, 'keywords': 3.0, 'fact_check': 4.0, 'write': 6.0}
+    assert critical_path(TASKS, durations) == (['research', 'fact_check', 'write'], 20.0)
+
+    durations['keywords'] = 30.0
+    assert critical_path(TASKS, durations) == (['keywords', 'write'], 36.0)
+
+
+def test_validate_pipeline_reports_unknown_references():
+    config = {'agents': {'writer': {'factory': 'create_news_writer'}}, 'tasks': {'write': task('missing')}}
+    with pytest.raises(ValueError, match="unknown task 'missing'"):
+        validate_pipeline(config)
+
+    config = {'agents': {'writer': {'factory': 'create_editor'}}, 'tasks': {'write': task()}}
+    with pytest.raises(ValueError, match="unknown factory"):
+        validate_pipeline(config)
+
+
+def test_bundled_pipeline_is_valid():
+    config = load_pipeline(os.path.join(ROOT, 'pipelines', 'default.json'))
+    assert topological_order(config['tasks'])[-1] == 'write'
+
+
+# ----------------------------------------------------------------------
+# Scheduler (run_pipeline with a stub _run_node)
+# ----------------------------------------------------------------------
+
+
+@pytest.fixture
+def stub_nodes(monkeypatch):
+    calls = {}
+    lock = threading.Lock()
+
+    def install(seconds=0.2, failing=()):
+        def run_node(name, config, inputs, upstream):
+            with lock:
+                calls[name] = {'upstream': dict(upstream), 'inputs': dict(inputs), 'run_id': current_run_id()}
+            time.sleep(seconds)
+            if name in failing:
+                raise RuntimeError(f"{name} failed")
+            return f"{name} output", seconds
+
+        monkeypatch.setattr(pipeline, '_run_node', run_node)
+        return calls
+
+    return install
+
+
+def test_independent_tasks_run_concurrently(stub_nodes):
+    calls = stub_nodes(seconds=0.2)
+    config = {'tasks': TASKS}
+
+    with run_context('pipeline-run'):
+        outputs, report = run_pipeline(config, {'topic': 'AI'}, max_workers=4)
+
+    # research and keywords overlap: three waves of 0.2s instead of four
+    assert report['wall_time'] < 0.75
+    assert outputs == {name: f"{name} output" for name in TASKS}
+    assert report['failed'] == []
+    assert report['sequential_time'] == pytest.approx(0.8)
+    assert report['critical_path'] == ['research', 'fact_check', 'write']
+    assert report['critical_path_time'] == pytest.approx(0.6)
+    assert set(report['durations']) == set(TASKS)
+    assert calls['research']['run_id'] == 'pipeline-run'
+    assert final_output(config, outputs) == 'write output'
+
+
+def test_upstream_outputs_reach_dependent_tasks(stub_nodes):
+    calls = stub_nodes(seconds=0.01)
+    run_pipeline({'tasks': TASKS}, {'topic': 'AI'})
+
+    assert calls['research']['upstream'] == {}
+    assert calls['fact_check']['upstream'] == {'research': 'research output'}
+    assert calls['write']['upstream'] == {'fact_check': 'fact_check output', 'keywords': 'keywords output'}
+    assert calls['write']['inputs'] == {'topic': 'AI'}
+
+
+def test_failure_marks_downstream_tasks_failed(stub_nodes):
+    calls = stub_nodes(seconds=0.01, failing={'research'})
+    outputs, report = run_pipeline({'tasks': TASKS}, {'topic': 'AI'})
+
+    assert report['failed'] == ['fact_check', 'research', 'write']
+    assert outputs == {'keywords': 'keywords output'}
+    assert set(calls) == {'research', 'keywords'}
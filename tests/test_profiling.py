@@ -0,0 +1,70 @@
+import threading
+import time
+import tracemalloc
+
+from profiling import RunProfiler
+
+
+def busy(seconds):
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        sum(range(1000))
+
+
+def test_profile_files_and_summary(tmp_path):
+    with RunProfiler(str(tmp_path), 'profile-run1', interval=0.005) as profiler:
+        busy(0.1)
+    assert set(profiler.files) == {'collapsed', 'cpu', 'alloc'}
+    assert 'busy (test_profiling.py' in open(profiler.files['collapsed']).read()
+    assert profiler.summary.startswith('Wall time:')
+    assert not tracemalloc.is_tracing()
+
+
+def test_overlapping_profiles_share_tracemalloc(tmp_path):
+    errors = []
+    first_inside = threading.Event()
+    second_done = threading.Event()
+
+    def first():
+        try:
+            with RunProfiler(str(tmp_path), 'profile-first', interval=0.005):
+                first_inside.set()
+                second_done.wait(5)
+                busy(0.05)
+        except Exception as e:
+            errors.append(e)
+
+    thread = threading.Thread(target=first)
+    thread.start()
+    first_inside.wait(5)
+    # The second run starts and finishes while the first is still profiling
+    with RunProfiler(str(tmp_path), 'profile-second', interval=0.005):
+        busy(0.05)
+    assert tracemalloc.is_tracing()
+    second_done.set()
+    thread.join()
+
+    assert errors == []
+    assert not tracemalloc.is_tracing()
+
+
+def test_only_the_run_thread_is_sampled(tmp_path):
+    stop = threading.Event()
+
+    def other_session():
+        while not stop.is_set():
+            busy(0.01)
+
+    other = threading.Thread(target=other_session, name='other-session')
+    other.start()
+    try:
+        with RunProfiler(str(tmp_path), 'profile-run', interval=0.005) as profiler:
+            time.sleep(0.1)
+    finally:
+        stop.set()
+        other.join()
+
+    collapsed = open(profiler.files['collapsed']).read()
+    assert 'other-session' not in collapsed
+    assert 'other_session' not in collapsed
+    assert 'test_only_the_run_thread_is_sampled' in collapsed
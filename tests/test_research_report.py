@@ -0,0 +1,54 @@
+import json
+
+import pytest
+
+from research_report import load_report, parse_report, report_path, save_report, slugify, to_prompt_json
+
+REPORT = {
+    'topic': 'AI in healthcare',
+    'trend': 'Hospitals adopt AI triage.',
+    'claims': [{'statement': 'AI reads scans faster.', 'sources': [1]}],
+    'sources': [{'id': 1, 'title': 'Radiology study', 'url': 'https://example.com/study'}],
+    'pros': ['Faster diagnosis'],
+    'cons': [],
+    'risks': ['Bias'],
+    'opportunities': [],
+}
+
+
+def test_parse_report_accepts_plain_json():
+    report = parse_report(json.dumps(REPORT))
+    assert report.trend == 'Hospitals adopt AI triage.'
+    assert report.claims[0].sources == [1]
+
+
+def test_parse_report_tolerates_text_around_the_json():
+    text = f"Thought: I now know the final answer\n```json\n{json.dumps(REPORT)}\n```"
+    assert parse_report(text).sources[0].url == 'https://example.com/study'
+
+
+def test_parse_report_rejects_missing_or_invalid_json():
+    with pytest.raises(ValueError, match='does not contain'):
+        parse_report('Three paragraphs of prose.')
+    with pytest.raises(ValueError, match='not a valid report'):
+        parse_report('{"topic": "AI"}')
+
+
+def test_prompt_json_is_compact_and_drops_empty_lists():
+    prompt = to_prompt_json(parse_report(json.dumps(REPORT)))
+    assert prompt.startswith('{"topic":"AI in healthcare","trend":')
+    assert '"cons"' not in prompt and '"opportunities"' not in prompt
+
+
+def test_save_and_load_round_trip(tmp_path):
+    report = parse_report(json.dumps(REPORT))
+    path = save_report(report, directory=str(tmp_path))
+    assert path == report_path('AI in healthcare', directory=str(tmp_path))
+    assert path.endswith('ai-in-healthcare.json')
+    assert load_report('AI in healthcare', directory=str(tmp_path)) == report
+    assert load_report('AI in finance', directory=str(tmp_path)) is None
+
+
+def test_slugify():
+    assert slugify('AI in Healthcare: 2025!') == 'ai-in-healthcare-2025'
+    assert slugify('???') == 'topic'
@@ -0,0 +1,58 @@
+from search_ranking import (
+    BM25, format_serper_results, parse_serper_results, rank_results, tokenize, trim_snippet,
+)
+
+
+def result(title, snippet, link='https://example.com'):
+    return {'title': title, 'link': link, 'snippet': snippet}
+
+
+def test_tokenize_drops_stopwords_and_punctuation():
+    assert tokenize("The future of AI, in Healthcare!") == ['future', 'ai', 'healthcare']
+
+
+def test_bm25_prefers_documents_with_rarer_query_terms():
+    bm25 = BM25([['ai', 'radiology'], ['ai', 'finance'], ['ai', 'music']])
+    scores = bm25.scores(['radiology'])
+    assert scores[0] > 0
+    assert scores[1] == scores[2] == 0
+
+
+def test_rank_results_orders_by_relevance_and_drops_unrelated():
+    results = [
+        result("Football scores", "Weekend football results and league tables."),
+        result("Healthcare budgets", "Hospital budgets rose this year."),
+        result("AI in radiology", "Radiology departments adopt AI to read scans in healthcare."),
+    ]
+    ranked = rank_results(results, "AI radiology", topic="AI in healthcare")
+    assert [r['title'] for r in ranked] == ["AI in radiology", "Healthcare budgets"]
+
+
+def test_rank_results_removes_near_duplicates():
+    snippet = "Hospitals are deploying AI models to triage radiology scans faster than before."
+    results = [
+        result("AI triage", snippet, 'https://a.example'),
+        result("AI triage (syndicated)", snippet, 'https://b.example'),
+        result("AI diagnostics", "Pathology labs use AI for faster diagnostics."),
+    ]
+    ranked = rank_results(results, "AI radiology diagnostics")
+    assert len(ranked) == 2
+    assert {r['link'] for r in ranked} != {'https://a.example', 'https://b.example'}
+
+
+def test_rank_results_respects_top_n_and_char_budget():
+    results = [result(f"AI trend {i}", "AI adoption keeps growing. " * 5) for i in range(10)]
+    assert len(rank_results(results, "AI", top_n=3, dedup_threshold=1.1)) == 3
+    budgeted = rank_results(results, "AI", top_n=10, char_budget=300, dedup_threshold=1.1)
+    assert 1 <= len(budgeted) < 10
+
+
+def test_trim_snippet_keeps_matching_sentences_in_order():
+    snippet = "Weather was mild. AI helps radiologists. Markets were flat. Radiology AI is regulated."
+    trimmed = trim_snippet(snippet, tokenize("AI radiology"), 60)
+    assert trimmed == "AI helps radiologists. Radiology AI is regulated."
+
+
+def test_parse_and_format_round_trip():
+    results = [result("One", "First snippet."), result("Two", "Second snippet.")]
+    assert parse_serper_results(format_serper_results(results)) == results
@@ -0,0 +1,112 @@
+import threading
+import time
+
+import pytest
+
+from singleflight import SingleFlight, make_key
+
+
+def run_concurrently(count, target):
+    barrier = threading.Barrier(count)
+    results = [None] * count
+
+    def worker(index):
+        barrier.wait()
+        try:
+            results[index] = target()
+        except Exception as e:
+            results[index] = e
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+def test_concurrent_calls_with_one_key_execute_once():
+    flight = SingleFlight('test')
+    executions = []
+
+    def slow():
+        executions.append(1)
+        time.sleep(0.2)
+        return 'result'
+
+    results = run_concurrently(8, lambda: flight.do('key', slow))
+
+    assert results == ['result'] * 8
+    assert len(executions) == 1
+    stats = flight.get_stats()
+    assert stats['calls'] == 8
+    assert stats['executed'] == 1
+    assert stats['coalesced'] == 7
+    assert stats['in_flight'] == 0
+
+
+def test_leader_exception_reaches_every_waiter():
+    flight = SingleFlight('test')
+    error = RuntimeError('search failed')
+
+    def failing():
+        time.sleep(0.2)
+        raise error
+
+    results = run_concurrently(5, lambda: flight.do('key', failing))
+
+    assert all(result is error for result in results)
+    stats = flight.get_stats()
+    assert stats['executed'] == 1
+    assert stats['errors'] == 1
+
+
+def test_different_keys_do_not_coalesce():
+    flight = SingleFlight('test')
+    counter = iter(range(100))
+    lock = threading.Lock()
+
+    def call():
+        with lock:
+            key = next(counter)
+        return flight.do(key, time.sleep, 0.05)
+
+    run_concurrently(4, call)
+
+    assert flight.get_stats()['executed'] == 4
+    assert flight.get_stats()['coalesced'] == 0
+
+
+def test_finished_calls_are_not_cached():
+    flight = SingleFlight('test')
+    values = iter([1, 2])
+
+    assert flight.do('key', lambda: next(values)) == 1
+    assert flight.do('key', lambda: next(values)) == 2
+
+
+def test_make_key_ignores_dict_order():
+    assert make_key({'a': 1, 'b': 2}) == make_key({'b': 2, 'a': 1})
+    assert make_key('search', 'x') != make_key('search', 'y')
+
+
+def test_exception_in_leader_is_raised_to_leader():
+    flight = SingleFlight('test')
+    with pytest.raises(ValueError):
+        flight.do('key', int, 'not a number')
+    assert flight.get_stats()['in_flight'] == 0
+
+
+def test_coalescing_stats_since_an_earlier_snapshot():
+    from singleflight import get_coalescing_stats, search_flight
+
+    search_flight.do('earlier run', lambda: None)
+    before = get_coalescing_stats()
+    search_flight.do('this run', lambda: None)
+    search_flight.do('this run again', lambda: None)
+
+    stats = get_coalescing_stats(since=before)
+    assert stats['search']['calls'] == 2
+    assert stats['search']['executed'] == 2
+    assert stats['llm']['calls'] == 0
+    assert get_coalescing_stats()['search']['calls'] >= 3
@@ -4,12 +4,27 @@ Handles web search functionality using SerperDev API
 """
 
 from dotenv import load_dotenv
+import contextlib
+import contextvars
+import functools
 import os
 import sys
 
+import requests
+
+from circuit_breaker import CallTimeoutError, CircuitBreaker, CircuitOpenError, StaleCache
+from event_log import env_flag, get_event_log
+from search_ranking import format_serper_results, parse_serper_results, rank_results
+from singleflight import coalesce, search_flight, search_key
+
 # Load environment variables from .env file
 load_dotenv()
 
+log = get_event_log()
+
+# Topic of the run currently using the tool, used to rank search results
+_search_topic = contextvars.ContextVar('search_topic', default=None)
+
 def setup_serper_tool():
     """
     Set up the SerperDev tool with proper error handling
@@ -18,13 +33,16 @@ def setup_serper_tool():
     serper_api_key = os.getenv('SERPER_API_KEY')
     
     if not serper_api_key:
-        print("⚠️  Warning: SERPER_API_KEY not found in environment variables")
-        print("   Please set your Serper API key in:")
-        print("   1. .env file: SERPER_API_KEY=your_key_here")
-        print("   2. Or set it manually in the Streamlit sidebar")
-        print("   Get your key from: https://serper.dev/")
+        log.warning(
+            'serper_key_missing',
+            "⚠️  Warning: SERPER_API_KEY not found in environment variables\n"
+            "   Please set your Serper API key in:\n"
+            "   1. .env file: SERPER_API_KEY=your_key_here\n"
+            "   2. Or set it manually in the Streamlit sidebar\n"
+            "   Get your key from: https://serper.dev/"
+        )
     else:
-        print("✅ Serper API key loaded successfully")
+        log.info('serper_key_loaded', "✅ Serper API key loaded successfully")
     
     # Set the environment variable for the tool
     os.environ['SERPER_API_KEY'] = serper_api_key or ""
@@ -32,19 +50,29 @@ def setup_serper_tool():
     try:
         from crewai_tools import SerperDevTool
         
-        # Initialize the tool
-        tool = SerperDevTool()
-        print("✅ SerperDev tool initialized successfully")
+        # Initialize the tool (SERPER_SEARCH_URL points it at another endpoint, e.g. a local fake)
+        search_url = os.getenv('SERPER_SEARCH_URL')
+        tool = SerperDevTool(search_url=search_url) if search_url else SerperDevTool()
+        log.info('serper_tool_ready', "✅ SerperDev tool initialized successfully")
         return tool
         
     except ImportError as e:
-        print(f"❌ Error importing SerperDevTool: {e}")
-        print("   Please install crewai-tools: pip install crewai-tools")
+        log.error(
+            'serper_tool_import_failed',
+            f"❌ Error importing SerperDevTool: {e}\n"
+            "   Please install crewai-tools: pip install crewai-tools",
+            error=str(e)
+        )
+        log.close()
         sys.exit(1)
         
     except Exception as e:
-        print(f"❌ Error initializing SerperDev tool: {e}")
-        print("   Please check your SERPER_API_KEY")
+        log.error(
+            'serper_tool_init_failed',
+            f"❌ Error initializing SerperDev tool: {e}\n"
+            "   Please check your SERPER_API_KEY",
+            error=str(e)
+        )
         # Return None so the app can handle the error gracefully
         return None
 
@@ -64,26 +92,206 @@ def validate_api_keys():
             missing_keys.append(f"{key} ({description})")
     
     if missing_keys:
-        print("\n⚠️  Missing API Keys:")
-        for key in missing_keys:
-            print(f"   - {key}")
-        print("\nPlease set these in your .env file or Streamlit sidebar")
+        log.warning(
+            'api_keys_missing',
+            "\n⚠️  Missing API Keys:\n"
+            + "\n".join(f"   - {key}" for key in missing_keys)
+            + "\n\nPlease set these in your .env file or Streamlit sidebar",
+            missing=missing_keys
+        )
         return False
     
-    print("✅ All required API keys are present")
+    log.info('api_keys_present', "✅ All required API keys are present")
     return True
 
+@contextlib.contextmanager
+def search_topic(topic):
+    """
+    Make the run's {topic} available to the search ranking stage
+    """
+    token = _search_topic.set(topic)
+    try:
+        yield
+    finally:
+        _search_topic.reset(token)
+
+def add_ranking_stage(tool):
+    """
+    Re-rank search results with BM25 against the query and current topic,
+    dropping near-duplicates and keeping the top results within a character
+    budget so less text reaches the researcher's prompt
+    """
+    if tool is None or not env_flag('CREW_SEARCH_RANKING', default=True):
+        return tool
+
+    top_n = int(os.getenv('CREW_SEARCH_TOP_N', '5'))
+    char_budget = int(os.getenv('CREW_SEARCH_CHAR_BUDGET', '3000'))
+    snippet_chars = int(os.getenv('CREW_SEARCH_SNIPPET_CHARS', '400'))
+    search = tool._run
+
+    @functools.wraps(search)
+    def ranked_search(*args, **kwargs):
+        results = search(*args, **kwargs)
+        if not isinstance(results, str):
+            return results
+
+        # Keep notices placed before the results (e.g. the stale-cache warning)
+        header, marker, body = results.partition('Search results:')
+        if not marker:
+            return results
+        parsed = parse_serper_results(body)
+        if not parsed:
+            return results
+
+        query = kwargs.get('search_query') or kwargs.get('query') or ''
+        ranked = rank_results(
+            parsed, query, topic=_search_topic.get(),
+            top_n=top_n, char_budget=char_budget, snippet_chars=snippet_chars
+        )
+        trimmed = format_serper_results(ranked)
+        if header.strip():
+            trimmed = header.rstrip('\n') + trimmed
+        log.debug(
+            'search_ranked',
+            query=query,
+            results_in=len(parsed),
+            results_out=len(ranked),
+            chars_in=len(results),
+            chars_out=len(trimmed)
+        )
+        return trimmed
+
+    object.__setattr__(tool, '_run', ranked_search)
+    return tool
+
+# Seconds a Serper request may take, enforced on the HTTP connection itself
+SEARCH_TIMEOUT = float(os.getenv('CREW_SEARCH_TIMEOUT', '10'))
+
+search_breaker = CircuitBreaker(
+    'search',
+    failure_threshold=int(os.getenv('CREW_SEARCH_FAILURE_THRESHOLD', '3')),
+    recovery_timeout=float(os.getenv('CREW_SEARCH_RECOVERY_SECONDS', '30'))
+)
+search_cache = StaleCache(max_entries=int(os.getenv('CREW_SEARCH_STALE_ENTRIES', '256')))
+
+def add_search_timeout(tool, timeout=None):
+    """
+    Replace SerperDevTool's request, which has no timeout, with one that
+    gives up after timeout seconds. A hung Serper call then fails with
+    CallTimeoutError instead of holding its thread until the socket dies.
+    Results are formatted exactly like SerperDevTool's
+    """
+    if tool is None:
+        return tool
+
+    timeout = SEARCH_TIMEOUT if timeout is None else timeout
+
+    def timed_search(*args, **kwargs):
+        query = kwargs.get('search_query') or kwargs.get('query') or (args[0] if args else '')
+        n_results = kwargs.get('n_results') or getattr(tool, 'n_results', None) or 10
+        payload = {'q': query, 'num': n_results}
+        for field, key in (('country', 'gl'), ('location', 'location'), ('locale', 'hl')):
+            if getattr(tool, field, None):
+                payload[key] = getattr(tool, field)
+        headers = {'X-API-KEY': os.getenv('SERPER_API_KEY', ''), 'content-type': 'application/json'}
+        try:
+            response = requests.post(tool.search_url, headers=headers, json=payload, timeout=timeout)
+        except requests.Timeout as e:
+            raise CallTimeoutError(f"Serper did not answer within {timeout:.1f}s") from e
+
+        results = response.json()
+        if 'organic' not in results:
+            return results
+        return format_serper_results([
+            result for result in results['organic'][:n_results]
+            if all(field in result for field in ('title', 'link', 'snippet'))
+        ])
+
+    object.__setattr__(tool, '_run', timed_search)
+    return tool
+
+def _is_failed_search(results):
+    # SerperDevTool returns the raw JSON body (not an exception) on API errors
+    return not isinstance(results, str) and (
+        not isinstance(results, dict) or 'statusCode' in results or 'message' in results
+    )
+
+def add_circuit_breaker(tool, breaker=None, cache=None):
+    """
+    Put searches behind a circuit breaker. While Serper is failing, timing
+    out or the breaker is open, the last good results for the same query
+    are returned flagged as stale, or a short notice if none exist
+    """
+    if tool is None:
+        return tool
+
+    breaker = breaker or search_breaker
+    cache = cache or search_cache
+
+    search = tool._run
+
+    @functools.wraps(search)
+    def protected_search(*args, **kwargs):
+        key = search_key(*args, **kwargs)
+        try:
+            results = breaker.call(search, *args, is_failure=_is_failed_search, **kwargs)
+            if not _is_failed_search(results):
+                cache.put(key, results)
+                return results
+            reason = f"Serper returned an error: {results}"
+        except CircuitOpenError as e:
+            reason = str(e)
+        except Exception as e:
+            reason = f"{type(e).__name__}: {e}"
+
+        query = kwargs.get('search_query') or kwargs.get('query')
+        cached = cache.get(key)
+        log.warning(
+            'search_degraded',
+            f"⚠️  Web search unavailable ({reason}); "
+            + ("serving stale cached results" if cached else "no cached results"),
+            query=query,
+            reason=reason,
+            stale=cached is not None,
+            breaker=breaker.get_stats()
+        )
+        if cached is None:
+            return (
+                "Web search is temporarily unavailable and there are no cached "
+                "results for this query. Continue with what you already know."
+            )
+        results, age = cached
+        return (
+            f"[STALE RESULTS: live web search is unavailable, these results were "
+            f"cached {age / 60:.0f} minutes ago and may be out of date]\n{results}"
+        )
+
+    object.__setattr__(tool, '_run', protected_search)
+    return tool
+
 # Initialize the tool
 tool = setup_serper_tool()
 
+# Bound the time spent on Serper and fall back to stale results during outages
+tool = add_search_timeout(tool)
+tool = add_circuit_breaker(tool)
+
+# Share one in-flight request between concurrent identical searches
+tool = coalesce(tool, '_run', search_flight, search_key)
+
+# Rank per caller, outside the coalesced call, so each run uses its own topic
+tool = add_ranking_stage(tool)
+
 # Export for use in other modules
-__all__ = ['tool', 'setup_serper_tool', 'validate_api_keys']
+__all__ = ['tool', 'setup_serper_tool', 'validate_api_keys', 'search_topic', 'add_ranking_stage',
+           'add_search_timeout', 'add_circuit_breaker', 'search_breaker', 'search_cache']
 
 if __name__ == "__main__":
     # Test the tool setup when run directly
-    print("Testing tool setup...")
+    log.info('tool_self_test', "Testing tool setup...")
     validate_api_keys()
     if tool:
-        print("✅ Tools setup completed successfully")
+        log.info('tool_self_test_passed', "✅ Tools setup completed successfully")
     else:
-        print("❌ Tools setup failed")
\ No newline at end of file
+        log.error('tool_self_test_failed', "❌ Tools setup failed")
+    log.flush()
\ No newline at end of file